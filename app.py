@@ -2,25 +2,18 @@ import os
 import logging
 import sys
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager
+from logconfig import configure_logging
 
 # Set UTF-8 encoding
 if sys.version_info >= (3, 7):
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
-# Configure logging with UTF-8 encoding
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 # Set default encoding for string operations
 os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
 
@@ -32,7 +25,20 @@ db = SQLAlchemy(model_class=Base)
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+# Trust X-Forwarded-* only from this many proxies in front of the app; with 0,
+# clients could otherwise spoof their IP past the per-IP rate limits
+proxy_hops = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+if proxy_hops:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops, x_host=proxy_hops)
+
+# Queued JSON logging with request ids; levels from LOG_LEVEL / LOG_LEVELS
+configure_logging(app)
+
+# Share compiled templates between workers and across restarts
+# (populate at deploy time with `flask precompile-templates`)
+jinja_cache_dir = os.environ.get("JINJA_CACHE_DIR", os.path.join(app.instance_path, "jinja_cache"))
+os.makedirs(jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
 
 # Configure the database
 database_url = os.environ.get("DATABASE_URL", "sqlite:///portfolio.db")
@@ -44,6 +50,38 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+# Live counters: "local" for a single process, "sqlite" to share across workers
+app.config["REALTIME_BACKEND"] = os.environ.get("REALTIME_BACKEND", "local")
+# Only open /api/stream when the server runs threaded or async workers: every
+# open stream holds a worker for up to REALTIME_STREAM_SECONDS
+app.config["REALTIME_STREAMING"] = os.environ.get("REALTIME_STREAMING", "").lower() in ("1", "true", "yes")
+app.config["REALTIME_STREAM_SECONDS"] = float(os.environ.get("REALTIME_STREAM_SECONDS", "60"))
+
+# Half-life of likes and comments in the trending ranking
+app.config["TRENDING_HALF_LIFE_DAYS"] = float(os.environ.get("TRENDING_HALF_LIFE_DAYS", "7"))
+
+# Rate limit buckets: "memory" per process, "sqlite" shared by all workers
+app.config["RATELIMIT_STORAGE"] = os.environ.get("RATELIMIT_STORAGE", "memory")
+
+# Static export target; when set, admin commits re-export the affected pages
+app.config["STATIC_EXPORT_DIR"] = os.environ.get("STATIC_EXPORT_DIR")
+app.config["STATIC_EXPORT_BASE_URL"] = os.environ.get("STATIC_EXPORT_BASE_URL", "http://localhost/")
+
+# Retention: read contacts and approved comments older than this move to the archive
+app.config["RETENTION_CONTACT_DAYS"] = int(os.environ.get("RETENTION_CONTACT_DAYS", "90"))
+app.config["RETENTION_COMMENT_DAYS"] = int(os.environ.get("RETENTION_COMMENT_DAYS", "365"))
+app.config["ARCHIVE_DIR"] = os.environ.get("ARCHIVE_DIR")
+
+# Upload limits: request bodies, stored image files and decoded pixels
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_UPLOAD_MB", "8")) * 1024 * 1024
+app.config["UPLOAD_MAX_BYTES"] = app.config["MAX_CONTENT_LENGTH"]
+# NDJSON imports are streamed in chunks, so backups get their own, larger cap
+app.config["IMPORT_MAX_BYTES"] = int(os.environ.get("IMPORT_MAX_MB", "512")) * 1024 * 1024
+app.config["UPLOAD_MAX_PIXELS"] = int(os.environ.get("UPLOAD_MAX_PIXELS", str(24_000_000)))
+
+# Pre-moderation: new comments wait in the moderation queue until approved
+app.config["COMMENTS_REQUIRE_APPROVAL"] = os.environ.get("COMMENTS_REQUIRE_APPROVAL", "").lower() in ("1", "true", "yes")
+
 # Initialize the app with the extension
 db.init_app(app)
 
@@ -61,14 +99,26 @@ with app.app_context():
     # Import models to ensure tables are created
     import models  # noqa: F401
     db.create_all()
+    # create_all() skips indexes added later to tables that already exist
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+# Use orjson for jsonify() when it is installed
+from serializers import orjson, OrjsonProvider
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
-# Import routes
+# Import routes and CLI commands
 import routes  # noqa: F401
+import commands  # noqa: F401
 
 # Initialize sample data on first run
 with app.app_context():
     from routes import create_sample_data
+    from ranking import ensure_rankings
     try:
         create_sample_data()
+        ensure_rankings()
     except Exception as e:
-        logging.error(f"Error creating sample data: {e}")
+        logging.getLogger(__name__).error("Error creating sample data: %s", e)
@@ -0,0 +1,146 @@
+"""Optional ASGI entry point.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 [--workers N]
+
+The read-only public JSON endpoints (``/api/projects``,
+``/api/projects/<id>``, ``/api/projects/<id>/likes`` and ``/api/counts``) are
+answered on the event loop with SQLAlchemy's async engine, so slow queries
+and many idle connections don't hold threads. Every other request (pages,
+forms, admin, SSE) goes to the unchanged Flask app through a2wsgi's
+thread-pool WSGI bridge. Both paths use the statements and encoders in ``public_api.py``.
+
+Requires uvicorn, a2wsgi, greenlet and aiosqlite (SQLite) or asyncpg
+(PostgreSQL); none of them are needed for the default WSGI deployment.
+"""
+import logging
+import os
+import re
+import time
+import uuid
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import app as flask_app, db
+from logconfig import REQUEST_ID_HEADER, access_logger
+import public_api
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+REQUEST_ID_KEY = REQUEST_ID_HEADER.lower().encode()
+
+
+def async_database_url(url):
+    """The async-driver equivalent of the app's database URL"""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f'No async driver configured for {backend}')
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == 'postgresql' and 'sslmode' in url.query:
+        # asyncpg spells libpq's sslmode as ssl
+        url = url.update_query_dict({'ssl': url.query['sslmode']}).difference_update_query(['sslmode'])
+    return url
+
+
+with flask_app.app_context():
+    # db.engine.url has Flask-SQLAlchemy's instance-relative SQLite path applied
+    engine = create_async_engine(async_database_url(db.engine.url),
+                                 **flask_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+
+wsgi = WSGIMiddleware(flask_app, workers=int(os.environ.get('ASGI_WSGI_THREADS', '16')))
+
+
+async def project_list(params):
+    statement = public_api.project_list_statement(params.get('category', 'all'), params.get('sort'))
+    async with engine.connect() as conn:
+        rows = (await conn.execute(statement)).all()
+    return 200, public_api.encode_project_list(rows)
+
+
+async def project_detail(params, project_id):
+    async with engine.connect() as conn:
+        row = (await conn.execute(public_api.project_statement(project_id))).first()
+        if row is None:
+            return 404, public_api.NOT_FOUND
+        comments = (await conn.execute(public_api.comments_statement(project_id))).all()
+    return 200, public_api.encode_project_detail(row, comments)
+
+
+async def project_likes(params, project_id):
+    async with engine.connect() as conn:
+        row = (await conn.execute(public_api.likes_statement(project_id))).first()
+    if row is None:
+        return 404, public_api.NOT_FOUND
+    return 200, public_api.encode_likes(row)
+
+
+async def counts(params):
+    async with engine.connect() as conn:
+        rows = (await conn.execute(public_api.counts_statement())).all()
+    return 200, public_api.encode_counts(rows)
+
+
+ROUTES = (
+    (re.compile(r'/api/projects'), project_list),
+    (re.compile(r'/api/projects/(\d+)'), project_detail),
+    (re.compile(r'/api/projects/(\d+)/likes'), project_likes),
+    (re.compile(r'/api/counts'), counts),
+)
+
+
+def _match(path):
+    for pattern, handler in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            return handler, [int(group) for group in match.groups()]
+    return None, None
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await engine.dispose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+
+    handler = None
+    if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+        handler, args = _match(scope['path'])
+    if handler is None:
+        await wsgi(scope, receive, send)
+        return
+
+    start = time.perf_counter()
+    headers = dict(scope['headers'])
+    incoming = headers.get(REQUEST_ID_KEY, b'').decode('latin-1')
+    request_id = incoming if 0 < len(incoming) <= 64 and incoming.isprintable() else uuid.uuid4().hex
+    params = {}
+    for key, value in parse_qsl(scope['query_string'].decode('latin-1')):
+        params.setdefault(key, value)  # First value wins, like request.args.get
+
+    status, body = await handler(params, *args)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (REQUEST_ID_KEY, request_id.encode()),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+    if access_logger.isEnabledFor(logging.INFO):
+        access_logger.info('%s %s %s', scope['method'], scope['path'], status,
+                           extra={'method': scope['method'], 'path': scope['path'], 'status': status,
+                                  'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+                                  'request_id': request_id, 'asgi': True})
@@ -0,0 +1,170 @@
+"""Concurrent-connection throughput of the public JSON API, WSGI vs ASGI mode.
+
+Usage: python benchmarks/asgi_throughput.py [--connections 16 128] [--seconds 5] [--sse 0 8]
+
+Starts one process of each server against a throwaway SQLite database:
+
+    wsgi  gunicorn --config gunicorn_config.py --workers 1 --threads 8 main:app
+    asgi  uvicorn asgi:application --workers 1
+
+and drives /api/projects, /api/projects/<id> and /api/projects/<id>/likes
+round-robin over N keep-alive connections. With --sse K, K clients hold
+/api/stream open for the whole run, as browsers on the site do.
+"""
+import argparse
+import asyncio
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONTENT_LENGTH = re.compile(rb'(?i)\r\ncontent-length: *(\d+)')
+
+
+def seed(projects):
+    import logging
+    from app import app, db
+    from models import Project
+    from ranking import rebuild_rankings
+
+    logging.disable(logging.CRITICAL)
+    with app.app_context():
+        for i in range(projects):
+            db.session.add(Project(
+                title=f'Projeto {i}', description='Descrição ' * 10,
+                short_description='Projeto de benchmark', category='fullstack',
+                technologies='Python, Flask, SQLAlchemy, PostgreSQL, React', order_priority=i))
+        db.session.commit()
+        rebuild_rankings()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port, env):
+    if mode == 'wsgi':
+        command = ['-m', 'gunicorn', '--config', 'gunicorn_config.py', '--workers', '1',
+                   '--threads', '8', '--bind', f'127.0.0.1:{port}', 'main:app']
+    else:
+        command = ['-m', 'uvicorn', 'asgi:application', '--workers', '1',
+                   '--port', str(port), '--log-level', 'warning']
+    server = subprocess.Popen([sys.executable, *command], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(600):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/projects', timeout=5).read()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f'{mode} server exited with {server.returncode}')
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+async def hold_stream(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'GET /api/stream HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n')
+    try:
+        while await reader.read(4096):
+            pass
+    finally:
+        writer.close()
+
+
+async def client(port, paths, deadline, latencies, failures):
+    reader = writer = None
+    i = 0
+    while time.perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n'.encode())
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), deadline - start)
+            await reader.readexactly(int(CONTENT_LENGTH.search(head).group(1)))
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError) as e:
+            # A request still waiting at the deadline is unfinished, not failed
+            if not isinstance(e, asyncio.TimeoutError):
+                failures.append(path)
+            writer.close()
+            writer = None
+            continue
+        if head.split(b' ', 2)[1] != b'200':
+            failures.append(path)
+        latencies.append(time.perf_counter() - start)
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, connections, seconds, sse):
+    paths = ['/api/projects', '/api/projects/1', '/api/projects/1/likes']
+    streams = [asyncio.create_task(hold_stream(port)) for _ in range(sse)]
+    await asyncio.sleep(0.5 if sse else 0)
+    latencies, failures = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(client(port, paths, deadline, latencies, failures)
+                           for _ in range(connections)))
+    for stream in streams:
+        stream.cancel()
+    await asyncio.gather(*streams, return_exceptions=True)
+    return latencies, failures
+
+
+def report(mode, connections, sse, seconds, latencies, failures):
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1000 if ordered else float('nan')
+    p99 = ordered[int(len(ordered) * 0.99) - 1] * 1000 if len(ordered) >= 100 else float('nan')
+    print(f'{mode:<5} connections={connections:<4} sse={sse:<3} '
+          f'{len(latencies) / seconds:8.0f} req/s  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  '
+          f'errors {len(failures)}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, nargs='+', default=[16, 128])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--sse', type=int, nargs='+', default=[0, 8])
+    parser.add_argument('--projects', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+    os.makedirs(os.environ['JINJA_CACHE_DIR'], exist_ok=True)
+    seed(args.projects)
+    env = dict(os.environ, LOG_LEVELS='access=WARNING')
+
+    for mode in ('wsgi', 'asgi'):
+        port = free_port()
+        server = start_server(mode, port, env)
+        try:
+            for sse in args.sse:
+                for connections in args.connections:
+                    latencies, failures = asyncio.run(drive(port, connections, args.seconds, sse))
+                    report(mode, connections, sse, args.seconds, latencies, failures)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                # Open event streams can keep a graceful shutdown waiting
+                server.kill()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Main-thread long tasks on the home page with hundreds of project cards.
+
+Usage: python benchmarks/frontend_long_tasks.py [--projects 500] [--cpu-throttle 4]
+                                                [--baseline REV] [--allow-network]
+                                                [--chromium PATH]
+
+Needs Playwright and its Chromium build, which the app itself never does:
+
+    pip install playwright && python -m playwright install chromium
+
+or --chromium pointing at an already installed Chrome/Chromium binary.
+
+Serves the real app from a throwaway SQLite database seeded with --projects
+projects and loads ``/`` in headless Chromium with the CPU slowed down
+--cpu-throttle times (a low-end phone is roughly 4-6x). Each run scrolls from
+top to bottom in fixed wheel steps while sweeping the pointer over the cards,
+then sits idle. Reported per run:
+
+    long tasks   count and longest PerformanceObserver 'longtask' entry (> 50 ms)
+    TBT          total blocking time, the sum of (duration - 50 ms) over long tasks
+    busy         main-thread task time during the scroll, from CDP Performance metrics
+    idle         main-thread task time per second once the page is left alone
+
+Runs: ``default`` (``?lowpower=0``, so machines with <= 2 cores don't switch
+it to low-power mode), ``reduced-motion`` (prefers-reduced-motion emulated),
+``low-power`` (``?lowpower=1``) and, with --baseline, ``baseline`` serving
+static/js and static/css from that git revision (templates stay current).
+Third-party requests (CDN Bootstrap, AOS, fonts) are aborted unless
+--allow-network is given, so results don't depend on the network.
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_FILES = ('static/js/animations.js', 'static/js/main.js', 'static/css/style.css')
+
+COLLECT_LONG_TASKS = """
+window.__longTasks = [];
+new PerformanceObserver(list => {
+    for (const entry of list.getEntries()) window.__longTasks.push(entry.duration);
+}).observe({type: 'longtask', buffered: true});
+"""
+
+
+def seed(projects):
+    from app import db
+    from models import Project
+    from ranking import rebuild_rankings
+
+    categories = ('frontend', 'backend', 'fullstack')
+    for i in range(projects):
+        db.session.add(Project(
+            title=f'Projeto {i}', description='Descrição ' * 10,
+            short_description='Projeto de benchmark', category=categories[i % 3],
+            technologies='Python, Flask, SQLAlchemy, PostgreSQL, React', order_priority=i))
+    db.session.commit()
+    rebuild_rankings()
+
+
+def serve(app):
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def baseline_files(revision):
+    return {path: subprocess.run(['git', 'show', f'{revision}:{path}'], cwd=ROOT,
+                                 capture_output=True, check=True).stdout
+            for path in BASELINE_FILES}
+
+
+def task_duration(cdp):
+    metrics = cdp.send('Performance.getMetrics')['metrics']
+    return next(m['value'] for m in metrics if m['name'] == 'TaskDuration')
+
+
+def measure(browser, url, args, reduced_motion=False, files=None):
+    parts = urlsplit(url)
+    origin = f'{parts.scheme}://{parts.netloc}'
+    context = browser.new_context(viewport={'width': 1280, 'height': 800},
+                                  reduced_motion='reduce' if reduced_motion else 'no-preference')
+    page = context.new_page()
+
+    def route(request_route):
+        request_url = request_route.request.url
+        if not request_url.startswith(origin):
+            if args.allow_network:
+                request_route.continue_()
+            else:
+                request_route.abort()
+            return
+        path = request_url[len(origin) + 1:].split('?', 1)[0]
+        if files and path in files:
+            content_type = 'text/css' if path.endswith('.css') else 'application/javascript'
+            request_route.fulfill(body=files[path], content_type=content_type)
+        else:
+            request_route.continue_()
+
+    page.route('**/*', route)
+    page.add_init_script(COLLECT_LONG_TASKS)
+    cdp = context.new_cdp_session(page)
+    cdp.send('Performance.enable')
+    cdp.send('Emulation.setCPUThrottlingRate', {'rate': args.cpu_throttle})
+
+    page.goto(url, wait_until='load')
+    start = task_duration(cdp)
+    height = page.evaluate('document.documentElement.scrollHeight')
+    steps = max(int(height / 400), 1)
+    for step in range(steps):
+        page.mouse.move(200 + (step * 97) % 880, 150 + (step * 53) % 500, steps=4)
+        page.mouse.wheel(0, 400)
+        page.wait_for_timeout(args.step_ms)
+    busy = task_duration(cdp) - start
+
+    before_idle = task_duration(cdp)
+    page.wait_for_timeout(args.idle_seconds * 1000)
+    idle = (task_duration(cdp) - before_idle) / args.idle_seconds
+
+    long_tasks = page.evaluate('window.__longTasks')
+    context.close()
+    return {
+        'long_tasks': len(long_tasks),
+        'longest': max(long_tasks, default=0),
+        'tbt': sum(duration - 50 for duration in long_tasks),
+        'busy': busy * 1000,
+        'idle': idle * 1000,
+        'steps': steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--cpu-throttle', type=float, default=4)
+    parser.add_argument('--step-ms', type=int, default=50)
+    parser.add_argument('--idle-seconds', type=int, default=3)
+    parser.add_argument('--baseline', metavar='REV')
+    parser.add_argument('--allow-network', action='store_true')
+    parser.add_argument('--chromium', metavar='PATH', help='Chrome/Chromium binary to use instead of '
+                        "Playwright's own build")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        sys.exit('playwright is not installed: pip install playwright && '
+                 'python -m playwright install chromium')
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+    os.makedirs(os.environ['JINJA_CACHE_DIR'], exist_ok=True)
+
+    from app import app
+
+    logging.disable(logging.CRITICAL)
+    app.config['RATELIMIT_ENABLED'] = False
+    with app.app_context():
+        seed(args.projects)
+    server = serve(app)
+    base_url = f'http://127.0.0.1:{server.server_port}/'
+
+    runs = [('default', base_url + '?lowpower=0', False, None),
+            ('reduced-motion', base_url + '?lowpower=0', True, None),
+            ('low-power', base_url + '?lowpower=1', False, None)]
+    if args.baseline:
+        runs.insert(0, ('baseline', base_url, False, baseline_files(args.baseline)))
+
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(executable_path=args.chromium)
+            for label, url, reduced_motion, files in runs:
+                result = measure(browser, url, args, reduced_motion, files)
+                print(f'{label:<15} {args.projects} projects, {args.cpu_throttle:g}x CPU, '
+                      f'{result["steps"]} scroll steps: '
+                      f'long tasks {result["long_tasks"]:4} (longest {result["longest"]:6.0f} ms)  '
+                      f'TBT {result["tbt"]:7.0f} ms  busy {result["busy"]:7.0f} ms  '
+                      f'idle {result["idle"]:5.0f} ms/s')
+            browser.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark template compilation and index page rendering.
+
+Usage: python benchmarks/render_index.py [--projects N] [--requests N]
+
+Runs against a throwaway SQLite database, so it never touches instance/.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def time_compile(app, bytecode_cache):
+    """Seconds to load base.html + index.html in a fresh environment"""
+    env = app.create_jinja_environment()
+    env.bytecode_cache = bytecode_cache
+    start = time.perf_counter()
+    env.get_template('index.html')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+    os.makedirs(os.environ['JINJA_CACHE_DIR'], exist_ok=True)
+
+    import logging
+    from jinja2 import FileSystemBytecodeCache
+    from app import app, db
+    from models import Project, User, ProjectLike
+
+    logging.disable(logging.CRITICAL)
+    app.config['RATELIMIT_ENABLED'] = False
+
+    with app.app_context():
+        user = User(username='bench', email='bench@example.com', full_name='Bench User')
+        user.set_password('bench-password')
+        db.session.add(user)
+        for i in range(args.projects):
+            db.session.add(Project(
+                title=f'Projeto {i}', description='Descrição ' * 10,
+                short_description='Projeto de benchmark', category='fullstack',
+                technologies='Python, Flask, SQLAlchemy, PostgreSQL, React', order_priority=i))
+        db.session.flush()
+        for project in Project.query.limit(args.projects // 2):
+            db.session.add(ProjectLike(user_id=user.id, project_id=project.id))
+        db.session.commit()
+        from ranking import rebuild_rankings
+        rebuild_rankings()
+
+    cold = time_compile(app, None)
+    cache = FileSystemBytecodeCache(os.environ['JINJA_CACHE_DIR'])
+    time_compile(app, cache)  # populate
+    warm = time_compile(app, cache)
+    print(f'template load (index.html + base.html): '
+          f'{cold * 1000:.2f} ms from source, {warm * 1000:.2f} ms from bytecode cache')
+
+    for label, login in (('anonymous', False), ('logged in', True)):
+        client = app.test_client()
+        if login:
+            client.post('/login', data={'username': 'bench', 'password': 'bench-password'})
+        client.get('/')  # warm up
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.get('/')
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200
+        print(f'GET / ({label}, {args.projects} projects): '
+              f'median {statistics.median(timings) * 1000:.2f} ms, '
+              f'p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark /api/projects serialization throughput.
+
+Usage: python benchmarks/serialize_projects.py [--projects N] [--rounds N]
+
+Compares the original ORM + dict + stdlib jsonify path with the DTO path,
+both with an empty row cache and with warm per-row bytes.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def legacy_payload(Project):
+    projects = Project.query.order_by(Project.order_priority.desc()).all()
+    projects_data = []
+    for project in projects:
+        projects_data.append({
+            'id': project.id,
+            'title': project.title,
+            'description': project.description,
+            'short_description': project.short_description,
+            'technologies': project.technologies.split(',') if project.technologies else [],
+            'github_url': project.github_url,
+            'live_url': project.live_url,
+            'image_url': project.image_url,
+            'category': project.category
+        })
+    return json.dumps(projects_data).encode('utf-8')
+
+
+def measure(label, fn, rows, rounds):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f'{label:<28} {elapsed * 1000:8.2f} ms/request {rows / elapsed:12,.0f} rows/s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=30)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+
+    import logging
+    from app import app, db
+    from models import Project
+    import serializers
+
+    logging.disable(logging.CRITICAL)
+    print(f"encoder: {'orjson' if serializers.orjson else 'stdlib json'}")
+
+    with app.app_context():
+        for i in range(args.projects):
+            db.session.add(Project(
+                title=f'Projeto {i}', description='Descrição detalhada do projeto. ' * 8,
+                short_description='Projeto de benchmark', category='fullstack',
+                technologies='Python,Flask,SQLAlchemy,PostgreSQL,React,Docker',
+                github_url='https://github.com/example/project', order_priority=i))
+        db.session.commit()
+        rows = Project.query.count()
+
+        def dto_payload(cache):
+            query = Project.query.order_by(Project.order_priority.desc())
+            return serializers.encode_rows(serializers.ProjectDTO,
+                                           query.with_entities(*serializers.ProjectDTO.columns).all(),
+                                           cache)
+
+        assert json.loads(legacy_payload(Project)) == json.loads(dto_payload(serializers.RowCache()))
+
+        warm_cache = serializers.RowCache()
+        measure('legacy ORM + dicts + json', lambda: legacy_payload(Project), rows, args.rounds)
+        measure('DTO, cold row cache', lambda: dto_payload(serializers.RowCache()), rows, args.rounds)
+        measure('DTO, warm row cache', lambda: dto_payload(warm_cache), rows, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
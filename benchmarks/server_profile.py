@@ -0,0 +1,126 @@
+"""Compare the plain gunicorn command with the preloading server profile.
+
+Usage: python benchmarks/server_profile.py [--workers N] [--projects N]
+
+For each setup it reports the time from launch until the first 200 on ``/``,
+the slowest of the first 2*N concurrent requests (cold workers), and per
+worker RSS, PSS and private memory from /proc after some traffic (Linux
+only). Runs against a throwaway SQLite database, so it never touches instance/.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(projects):
+    import logging
+    from app import app, db
+    from models import Project
+    from ranking import rebuild_rankings
+
+    logging.disable(logging.CRITICAL)
+    with app.app_context():
+        for i in range(projects):
+            db.session.add(Project(
+                title=f'Projeto {i}', description='Descrição ' * 10,
+                short_description='Projeto de benchmark', category='fullstack',
+                technologies='Python, Flask, SQLAlchemy, PostgreSQL, React', order_priority=i))
+        db.session.commit()
+        rebuild_rankings()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def memory_kb(pid):
+    """RSS, PSS and private (unshared) memory of a process in KiB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def run(label, args, workers, env):
+    port = free_port()
+    url = f'http://127.0.0.1:{port}/'
+    command = [sys.executable, '-m', 'gunicorn', *args, '--bind', f'127.0.0.1:{port}',
+               '--workers', str(workers), '--log-level', 'warning', 'main:app']
+    start = time.perf_counter()
+    server = subprocess.Popen(command, cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                fetch(url)
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError(f'{label}: gunicorn exited with {server.returncode}')
+                time.sleep(0.02)
+        first = time.perf_counter() - start
+
+        # Give every worker time to boot, then hit them all while still cold
+        time.sleep(1.0 + 0.2 * workers)
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            cold = list(pool.map(fetch, [url] * workers * 2))
+            list(pool.map(fetch, [url] * workers * 20))
+
+        memory = [memory_kb(pid) for pid in worker_pids(server.pid)]
+        rss, pss, private = (statistics.mean(values) / 1024 for values in zip(*memory))
+        print(f'{label:<9} workers={workers} first 200 after {first * 1000:7.0f} ms, '
+              f'slowest cold request {max(cold) * 1000:6.0f} ms, per worker: '
+              f'RSS {rss:5.1f} MiB, PSS {pss:5.1f} MiB, private {private:5.1f} MiB')
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--projects', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(workdir, 'jinja_cache')
+    os.makedirs(os.environ['JINJA_CACHE_DIR'], exist_ok=True)
+    seed(args.projects)
+
+    env = dict(os.environ)
+    for workers in args.workers:
+        # What .replit deploys today vs. the preloading profile
+        run('baseline', [], workers, env)
+        run('profile', ['--config', 'gunicorn_config.py'], workers, env)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Peak memory of processing one uploaded image, before and after uploads.py.
+
+Usage: python benchmarks/upload_memory.py
+
+Each (pipeline, image) pair runs in a fresh subprocess that imports only
+Pillow (and uploads.py with the default limits for the new pipeline), so the reported growth of peak RSS is the cost of that single
+upload. Peak RSS is read from VmHWM in /proc (Linux only); ru_maxrss would
+carry over the parent's peak across exec.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMAGES = {
+    'photo 6000x4000 JPEG': ('photo.jpg', 'RGB', (6000, 4000)),
+    'screenshot 2560x1600 PNG': ('screenshot.png', 'RGBA', (2560, 1600)),
+    'bomb 12000x12000 PNG': ('bomb.png', 'L', (12000, 12000)),
+}
+
+
+def make_images(directory):
+    from PIL import Image, ImageDraw
+
+    for filename, mode, size in IMAGES.values():
+        image = Image.new(mode, size)
+        if mode != 'L':
+            draw = ImageDraw.Draw(image)
+            for i in range(0, size[0], 40):
+                draw.line((i, 0, size[0] - i, size[1]), fill=(i % 255, 90, 200), width=7)
+        image.save(os.path.join(directory, filename))
+
+
+def legacy_save(path, target):
+    """The previous save_picture body"""
+    from PIL import Image
+
+    img = Image.open(path)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGB')
+    img.thumbnail((800, 600), Image.Resampling.LANCZOS)
+    img.save(target, 'JPEG', quality=90, optimize=True)
+
+
+def peak_rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    raise RuntimeError('VmHWM not available')
+
+
+def child(pipeline, path):
+    from PIL import Image  # noqa: F401  (imported before the baseline sample)
+
+    if pipeline == 'uploads':
+        import uploads
+    target = os.path.join(tempfile.mkdtemp(), 'out.jpg')
+    before = peak_rss_kb()
+    start = time.perf_counter()
+    outcome = 'saved'
+    try:
+        if pipeline == 'legacy':
+            legacy_save(path, target)
+        else:
+            with open(path, 'rb') as f:
+                uploads.save_image(f, target, (800, 600), 8 * 1024 * 1024, 24_000_000)
+    except Exception as e:
+        outcome = 'rejected' if type(e).__name__ == 'UploadError' else type(e).__name__
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_kb()
+    print(f'{(peak - before) / 1024:.1f} {elapsed * 1000:.0f} {outcome}')
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+        return
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    make_images(workdir)
+
+    for label, (filename, _, _) in IMAGES.items():
+        path = os.path.join(workdir, filename)
+        size_kb = os.path.getsize(path) / 1024
+        for pipeline in ('legacy', 'uploads'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', pipeline, path],
+                cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+            growth, elapsed, outcome = output[-3:]
+            print(f'{label:<26} {size_kb:8.0f} KiB  {pipeline:<8} '
+                  f'peak RSS +{float(growth):6.1f} MiB  {elapsed:>5} ms  {outcome}')
+
+
+if __name__ == '__main__':
+    main()
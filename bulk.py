@@ -0,0 +1,286 @@
+"""Streaming NDJSON import/export of portfolio content.
+
+Each line is one record: ``{"type": "project" | "skill" | "experience", ...columns}``.
+Project technologies are written as a JSON list. Export streams rows with
+``yield_per``; import reads line by line and upserts fixed-size chunks with
+one ``executemany`` per table and one transaction per chunk, so memory stays
+bounded no matter how large the file is. Once any chunk has committed, even
+if a later line fails, id sequences are synced and cached sections and the
+static export are refreshed.
+"""
+import json
+import logging
+import os
+import shutil
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from itertools import groupby
+
+from sqlalchemy import Boolean, Date, DateTime, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects import postgresql, sqlite
+from werkzeug.datastructures import FileStorage
+
+from app import app, db
+from models import Project, Skill, Experience
+from sections import invalidate_sections
+from serializers import dumps_bytes
+from static_export import refresh_static_export
+import uploads
+
+logger = logging.getLogger(__name__)
+
+MODELS = {
+    'project': Project,
+    'skill': Skill,
+    'experience': Experience,
+}
+
+
+class NDJSONError(ValueError):
+    """Raised for malformed NDJSON input; carries the offending line number"""
+
+    def __init__(self, line_number, message):
+        super().__init__(f'line {line_number}: {message}')
+        self.line_number = line_number
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_records(types=None, batch_size=1000):
+    """Yield one encoded NDJSON line (bytes) per record"""
+    for record_type, model in MODELS.items():
+        if types and record_type not in types:
+            continue
+        table = model.__table__
+        names = [column.name for column in table.columns]
+        rows = db.session.execute(
+            select(table).order_by(table.c.id).execution_options(yield_per=batch_size))
+        for row in rows:
+            record = {'type': record_type}
+            for name, value in zip(names, row):
+                record[name] = _json_value(value)
+            if record_type == 'project':
+                technologies = record.get('technologies') or ''
+                record['technologies'] = [tech.strip() for tech in technologies.split(',') if tech.strip()]
+            yield dumps_bytes(record) + b'\n'
+
+
+def _coerce(model, record):
+    """Map a decoded record onto the model's columns, converting types"""
+    values = {}
+    for column in model.__table__.columns:
+        if column.name not in record:
+            continue
+        value = record[column.name]
+        if value is not None:
+            if isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, Date):
+                value = date.fromisoformat(value)
+            elif isinstance(column.type, Boolean):
+                value = bool(value)
+        values[column.name] = value
+    if model is Project and isinstance(values.get('technologies'), list):
+        values['technologies'] = ','.join(values['technologies'])
+    return values
+
+
+def _insert(model):
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(model.__table__)
+    if dialect == 'sqlite':
+        return sqlite.insert(model.__table__)
+    return None
+
+
+def _required_columns(model):
+    """Columns an INSERT must provide: NOT NULL without any default"""
+    return {column.name for column in model.__table__.columns
+            if not column.nullable and not column.primary_key
+            and column.default is None and column.server_default is None}
+
+
+def _upsert(model, rows):
+    """executemany upsert keyed on id; rows without an id are plain inserts.
+
+    executemany needs the same keys on every row, so consecutive rows are
+    grouped by key set: a column a record leaves out keeps its stored value
+    (or gets its default on insert) instead of being written as NULL.
+    """
+    for keys, group in groupby(rows, key=lambda row: frozenset(row)):
+        group = list(group)
+        if 'id' not in keys or any(row['id'] is None for row in group):
+            db.session.execute(model.__table__.insert(), group)
+            continue
+
+        if not _required_columns(model) <= keys:
+            # Partial records can't be upserted: the INSERT half fails NOT NULL
+            # before the conflict is seen. Update the ids that exist instead.
+            table = model.__table__
+            existing = set(db.session.scalars(
+                select(table.c.id).where(table.c.id.in_([row['id'] for row in group]))))
+            updates = [row for row in group if row['id'] in existing]
+            inserts = [row for row in group if row['id'] not in existing]
+            if updates and len(keys) > 1:
+                db.session.execute(update(model), updates)
+            if inserts:
+                db.session.execute(table.insert(), inserts)
+            continue
+
+        stmt = _insert(model)
+        if stmt is None:
+            for row in group:
+                db.session.merge(model(**row))
+            continue
+        updates = {key: getattr(stmt.excluded, key) for key in keys if key != 'id'}
+        if updates:
+            stmt = stmt.on_conflict_do_update(index_elements=['id'], set_=updates)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=['id'])
+        db.session.execute(stmt, group)
+
+
+class ImageResolver:
+    """Resolve project image references, in parallel across a chunk"""
+
+    def __init__(self, media_dir=None, download=False, workers=8):
+        self.media_dir = media_dir
+        self.download = download
+        self.workers = workers
+
+    def resolve(self, image_url):
+        if not image_url:
+            return image_url
+        if image_url.startswith('uploads/'):
+            # Restoring a backup: copy the file from the exported media folder
+            target = os.path.join(app.static_folder, image_url)
+            source = os.path.join(self.media_dir, image_url) if self.media_dir else None
+            if not os.path.exists(target) and source and os.path.exists(source):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, target)
+            return image_url
+        if self.download and image_url.startswith(('http://', 'https://')):
+            from routes import save_picture
+            with urllib.request.urlopen(image_url, timeout=15) as response:
+                declared = response.headers.get('Content-Length')
+                if declared and declared.isdigit() and int(declared) > app.config['UPLOAD_MAX_BYTES']:
+                    raise uploads.UploadError(f'{image_url} is {declared} bytes')
+                data = uploads.spool(response, app.config['UPLOAD_MAX_BYTES'])
+            name = os.path.basename(image_url.split('?', 1)[0]) or 'image.jpg'
+            with data:
+                return save_picture(FileStorage(stream=data, filename=name), 'projects') or image_url
+        return image_url
+
+    def resolve_rows(self, rows):
+        pending = [row for row in rows if row.get('image_url')]
+        if not pending or (not self.media_dir and not self.download):
+            return
+
+        def resolve_row(row):
+            try:
+                row['image_url'] = self.resolve(row['image_url'])
+            except Exception as e:
+                logger.error("Error resolving image %s: %s", row['image_url'], e)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(resolve_row, pending))
+
+
+def _failing_line(chunk):
+    """Replay a failed chunk row by row in savepoints to find the bad line"""
+    for record_type, model in MODELS.items():
+        for line_number, values in chunk[record_type]:
+            try:
+                with db.session.begin_nested():
+                    _upsert(model, [values])
+            except SQLAlchemyError as e:
+                return line_number, getattr(e, 'orig', None) or e
+    return None, None
+
+
+def _flush(chunk, images):
+    images.resolve_rows([values for _, values in chunk['project']])
+    try:
+        for record_type, model in MODELS.items():
+            if chunk[record_type]:
+                _upsert(model, [values for _, values in chunk[record_type]])
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        line_number, error = _failing_line(chunk)
+        db.session.rollback()
+        if line_number is None:
+            line_numbers = [line for rows in chunk.values() for line, _ in rows]
+            raise NDJSONError(min(line_numbers),
+                              f'batch up to line {max(line_numbers)} failed: {getattr(e, "orig", None) or e}') from e
+        raise NDJSONError(line_number, str(error)) from e
+    for rows in chunk.values():
+        rows.clear()
+
+
+def _sync_sequences():
+    """Move PostgreSQL id sequences past explicitly imported ids"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for model in MODELS.values():
+        table = model.__table__.name
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM \"{table}\"), 1))"))
+    db.session.commit()
+
+
+def import_records(lines, batch_size=1000, images=None):
+    """Upsert NDJSON ``lines`` (bytes or str) in chunks; returns counts per type"""
+    images = images or ImageResolver()
+    chunk = {record_type: [] for record_type in MODELS}
+    counts = {record_type: 0 for record_type in MODELS}
+    pending = 0
+    committed = False
+
+    try:
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise NDJSONError(line_number, str(e)) from e
+            if not isinstance(record, dict):
+                raise NDJSONError(line_number, 'expected a JSON object')
+            try:
+                record_type = record.pop('type')
+                model = MODELS[record_type]
+                values = _coerce(model, record)
+            except (ValueError, KeyError, TypeError) as e:
+                raise NDJSONError(line_number, str(e)) from e
+
+            chunk[record_type].append((line_number, values))
+            counts[record_type] += 1
+            pending += 1
+            if pending >= batch_size:
+                _flush(chunk, images)
+                committed = True
+                pending = 0
+
+        if pending:
+            _flush(chunk, images)
+            committed = True
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Chunks committed before a failure stay imported, so they must
+        # become visible (and not collide with later inserts) either way
+        if committed:
+            _sync_sequences()
+            invalidate_sections()
+            refresh_static_export(api=True)
+    return counts
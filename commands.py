@@ -0,0 +1,78 @@
+"""Flask CLI commands (run with ``flask --app main <command>``)"""
+import os
+import sys
+
+import click
+
+from app import app
+import ranking
+from static_export import StaticExporter
+import bulk
+import retention
+
+
+@app.cli.command('rebuild-rankings')
+def rebuild_rankings_command():
+    """Recompute trending and popular project rankings from scratch."""
+    count = ranking.rebuild_rankings()
+    click.echo(f'Rebuilt rankings for {count} projects.')
+
+
+@app.cli.command('precompile-templates')
+def precompile_templates_command():
+    """Compile every template into the shared Jinja bytecode cache."""
+    env = app.jinja_env
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    click.echo(f'Precompiled {len(names)} templates.')
+
+
+@app.cli.command('export-static')
+@click.option('--output', '-o', default=None,
+              help='Target directory (defaults to STATIC_EXPORT_DIR or instance/static_site).')
+def export_static_command(output):
+    """Render the public pages into a directory any file server can serve."""
+    output = output or app.config.get('STATIC_EXPORT_DIR') or os.path.join(app.instance_path, 'static_site')
+    count = StaticExporter(output).export_all()
+    click.echo(f'Exported {count} pages to {output}.')
+
+
+@app.cli.command('export-ndjson')
+@click.option('--output', '-o', type=click.File('wb'), default='-', help='Target file (default: stdout).')
+@click.option('--type', 'types', multiple=True, type=click.Choice(list(bulk.MODELS)),
+              help='Only export these record types.')
+def export_ndjson_command(output, types):
+    """Stream projects, skills and experience as NDJSON."""
+    for line in bulk.export_records(types or None):
+        output.write(line)
+
+
+@app.cli.command('import-ndjson')
+@click.argument('source', type=click.File('rb'))
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per transaction.')
+@click.option('--media-dir', type=click.Path(exists=True, file_okay=False),
+              help='Folder holding uploads/ files referenced by image_url.')
+@click.option('--download-images', is_flag=True, help='Download and resize remote image URLs.')
+@click.option('--workers', default=8, show_default=True, help='Parallel image workers.')
+def import_ndjson_command(source, batch_size, media_dir, download_images, workers):
+    """Upsert projects, skills and experience from an NDJSON file ('-' for stdin)."""
+    images = bulk.ImageResolver(media_dir=media_dir, download=download_images, workers=workers)
+    try:
+        counts = bulk.import_records(source, batch_size=batch_size, images=images)
+    except bulk.NDJSONError as e:
+        click.echo(f'Import failed at {e}', err=True)
+        sys.exit(1)
+    click.echo(', '.join(f'{count} {record_type}' for record_type, count in counts.items()) + ' imported.')
+
+
+@app.cli.command('archive-old')
+@click.option('--contact-days', type=int, help='Archive read contacts older than this (default: RETENTION_CONTACT_DAYS).')
+@click.option('--comment-days', type=int, help='Archive approved comments older than this (default: RETENTION_COMMENT_DAYS).')
+@click.option('--batch-size', type=int, help='Rows moved per transaction.')
+@click.option('--dry-run', is_flag=True, help='Only report how many rows would be archived.')
+def archive_old_command(contact_days, comment_days, batch_size, dry_run):
+    """Move old contacts and comments into compressed archive segments."""
+    counts = retention.archive_old_records(contact_days, comment_days, batch_size, dry_run=dry_run)
+    verb = 'would be archived' if dry_run else 'archived'
+    click.echo(f"{counts['contact']} contacts and {counts['comment']} comments {verb}.")
@@ -92,6 +92,20 @@ class CommentForm(FlaskForm):
     
     submit = SubmitField('Comentar')
 
+class ModerationForm(FlaskForm):
+    """Bulk action over the comment moderation queue"""
+    action = SelectField('Ação', choices=[
+        ('approve', 'Aprovar'),
+        ('reject', 'Rejeitar')
+    ], validators=[DataRequired()])
+    
+    scope = SelectField('Aplicar a', choices=[
+        ('selected', 'Comentários selecionados'),
+        ('filter', 'Todos os pendentes do filtro')
+    ], default='selected')
+    
+    submit = SubmitField('Aplicar')
+
 class ProjectForm(FlaskForm):
     """Form for creating and editing projects"""
     title = StringField('Título', validators=[
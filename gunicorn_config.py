@@ -0,0 +1,106 @@
+"""Production server profile.
+
+    gunicorn --config gunicorn_config.py main:app
+
+The app is imported once in the master (``preload_app``), its caches are
+warmed, and the heap is frozen before workers fork, so templates, compiled
+SQL and mapper configuration live in copy-on-write pages shared by every
+worker instead of being rebuilt per process. Each worker starts with a fresh
+database connection pool.
+
+Live counters and rate limits use the shared SQLite backends by default
+here, and the server refuses to start several workers on per-process ones.
+
+Environment: ``PORT`` / ``GUNICORN_BIND``, ``WEB_CONCURRENCY`` (workers),
+``GUNICORN_THREADS`` (threads per worker; SSE clients hold one each for up
+to ``REALTIME_STREAM_SECONDS``).
+"""
+import gc
+import logging
+import multiprocessing
+import os
+import sys
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+preload_app = True
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Threaded workers can hold live-counter streams without blocking other requests
+os.environ.setdefault("REALTIME_STREAMING", "1")
+
+# Live counters and rate-limit buckets must be shared by all workers; the
+# per-process backends would only reach one worker's clients and multiply
+# every limit by the number of workers. Set before the app is preloaded.
+os.environ.setdefault("REALTIME_BACKEND", "sqlite")
+os.environ.setdefault("RATELIMIT_STORAGE", "sqlite")
+
+# Pages requested once in the master to fill the template, query and row caches
+WARM_URLS = ("/", "/api/projects", "/api/projects?sort=trending", "/api/projects?sort=popular")
+
+
+def warm_caches(app):
+    """Populate process-wide caches before workers fork"""
+    from sqlalchemy.orm import configure_mappers
+    from app import db
+    from models import Project
+
+    configure_mappers()
+    for name in app.jinja_env.list_templates(extensions=("html",)):
+        app.jinja_env.get_template(name)
+
+    with app.app_context():
+        urls = list(WARM_URLS)
+        project_id = db.session.query(Project.id).order_by(Project.id).limit(1).scalar()
+        if project_id is not None:
+            urls.append(f"/project/{project_id}")
+        client = app.test_client()
+        for url in urls:
+            response = client.get(url)
+            if response.status_code != 200:
+                logging.warning("Warmup request %s returned %s", url, response.status_code)
+        db.session.remove()
+        # The master never serves requests; don't hand its connections to the workers
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def on_starting(server):
+    from app import app
+
+    # --workers on the command line overrides this file, so check the final value
+    per_process = [name for name, value in (("REALTIME_BACKEND", "local"), ("RATELIMIT_STORAGE", "memory"))
+                   if app.config[name] == value]
+    if server.cfg.workers > 1 and per_process:
+        server.log.error("Refusing to start %d workers with per-process %s; use sqlite",
+                         server.cfg.workers, " and ".join(per_process))
+        sys.exit(1)
+
+
+def when_ready(server):
+    from app import app
+
+    try:
+        warm_caches(app)
+    except Exception as e:
+        # A cold worker is slower, not broken
+        server.log.error("Cache warmup failed: %s", e)
+
+    # Move everything allocated so far out of the collector's reach, so GC
+    # passes in the workers don't touch (and un-share) the inherited pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("Caches warmed; %d objects frozen before fork", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    from app import app, db
+
+    # Drop pool state inherited from the master without closing its sockets
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
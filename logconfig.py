@@ -0,0 +1,193 @@
+"""Non-blocking structured logging.
+
+Request threads only put records on a bounded in-memory queue; a single
+``QueueListener`` thread formats them and writes to stdout. When the queue is
+full, records are dropped and counted instead of blocking the request, and
+the number of dropped records is reported with the next record that gets
+through. Message formatting (``%``-args, JSON encoding) happens on the
+listener thread, so callers should pass args rather than pre-built strings.
+
+Environment:
+    LOG_LEVEL        root level (default INFO)
+    LOG_LEVELS       per-logger levels, e.g. ``routes=DEBUG,sqlalchemy.engine=INFO``
+    LOG_FORMAT       ``json`` (default) or ``text``
+    LOG_QUEUE_SIZE   queue capacity in records (default 10000)
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+# Chatty third-party loggers, unless LOG_LEVELS says otherwise
+DEFAULT_LEVELS = {
+    'sqlalchemy.engine': 'WARNING',
+    'werkzeug': 'WARNING',
+    'PIL': 'INFO',
+    'urllib3': 'INFO',
+}
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+access_logger = logging.getLogger('access')
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Tag records with the current request id (runs in the calling thread, before queueing)"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+        self._count_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Leave msg/args unformatted for the listener; only resolve what
+        # can't outlive this frame (the traceback)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        unreported = 0
+        if self._unreported:
+            with self._count_lock:
+                unreported, self._unreported = self._unreported, 0
+            record.dropped_before = unreported
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+                self._unreported += 1 + unreported
+
+
+_handler = None
+_listener = None
+
+
+def _build_sink(fmt):
+    sink = logging.StreamHandler(sys.stdout)
+    sink.setFormatter(JSONFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    return sink
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener(sinks, capacity):
+    global _listener
+    log_queue = queue.Queue(maxsize=capacity)
+    _handler.queue = log_queue
+    _listener = QueueListener(log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Flush and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records():
+    """Records dropped because the queue was full, since startup"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def configure_logging(app):
+    """Install the queue handler on the root logger and request id/timing hooks"""
+    global _handler
+    root = logging.getLogger()
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    for name, level in {**DEFAULT_LEVELS, **_parse_levels(os.environ.get('LOG_LEVELS'))}.items():
+        logging.getLogger(name).setLevel(level)
+
+    sinks = [_build_sink(os.environ.get('LOG_FORMAT', 'json').lower())]
+    capacity = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    _handler = DroppingQueueHandler(None)
+    _handler.addFilter(RequestContextFilter())
+    root.addHandler(_handler)
+    _start_listener(sinks, capacity)
+
+    def restart_in_child():
+        # The listener thread doesn't survive fork (gunicorn preload); give
+        # each child its own queue and thread
+        _handler._count_lock = threading.Lock()
+        _start_listener(sinks, capacity)
+
+    os.register_at_fork(after_in_child=restart_in_child)
+
+    atexit.register(stop_logging)
+
+    @app.before_request
+    def start_request_timer():
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = incoming if 0 < len(incoming) <= 64 and incoming.isprintable() else uuid.uuid4().hex
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        start = g.get('request_start')
+        if start is not None and access_logger.isEnabledFor(logging.INFO):
+            access_logger.info('%s %s %s', request.method, request.path, response.status_code,
+                               extra={'method': request.method, 'path': request.path,
+                                      'status': response.status_code,
+                                      'duration_ms': round((time.perf_counter() - start) * 1000, 2)})
+        return response
@@ -21,6 +21,7 @@ class Project(db.Model):
     # Relationships
     likes = db.relationship('ProjectLike', backref='project', lazy='dynamic', cascade='all, delete-orphan')
     comments = db.relationship('ProjectComment', backref='project', lazy='dynamic', cascade='all, delete-orphan')
+    ranking = db.relationship('ProjectRanking', backref='project', uselist=False, cascade='all, delete-orphan')
     
     @property
     def likes_count(self):
@@ -125,6 +126,27 @@ class ProjectComment(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_approved = db.Column(db.Boolean, default=True)  # Admin can moderate
+
+    # The moderation queue only ever reads pending rows, so index just those
+    __table_args__ = (
+        db.Index('ix_project_comments_pending', created_at, id,
+                 sqlite_where=is_approved.is_(False), postgresql_where=is_approved.is_(False)),
+    )
     
     def __repr__(self):
         return f'<ProjectComment by {self.user.username} on {self.project.title}>'
+
+class ProjectRanking(db.Model):
+    """Materialized popularity and trending scores, maintained by ranking.py"""
+    __tablename__ = 'project_rankings'
+    
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    likes_count = db.Column(db.Integer, nullable=False, default=0)
+    comments_count = db.Column(db.Integer, nullable=False, default=0)  # Approved only
+    # log2 of the time-decayed score, expressed at ranking.EPOCH so it never
+    # needs rewriting as time passes; NULL when the project has no activity
+    trending_key = db.Column(db.Float, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ProjectRanking project:{self.project_id} likes:{self.likes_count}>'
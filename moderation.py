@@ -0,0 +1,109 @@
+"""Comment moderation queue.
+
+Pending comments are read through the partial index
+``ix_project_comments_pending``, so the queue and its count never touch
+approved rows. Bulk actions are a single UPDATE (approve) or DELETE (reject)
+over either an explicit id list or the current queue filter. Approvals return
+the affected ``(project_id, created_at)`` pairs, which adjust the per-project
+counters in ``project_rankings`` instead of recounting comments.
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, tuple_, update
+
+from app import db
+from models import Project, ProjectComment, User
+import ranking
+
+ACTIONS = ('approve', 'reject')
+
+
+def parse_before(value):
+    """``YYYY-MM-DD`` (or full ISO timestamp) from a query string, else None"""
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def pending_criteria(project_id=None, before=None):
+    # Must stay ``IS 0`` / ``IS false`` to match the partial index predicate
+    criteria = [ProjectComment.is_approved.is_(False)]
+    if project_id:
+        criteria.append(ProjectComment.project_id == project_id)
+    if before:
+        criteria.append(ProjectComment.created_at < before)
+    return criteria
+
+
+def pending_count():
+    return db.session.query(func.count(ProjectComment.id)).filter(*pending_criteria()).scalar()
+
+
+def _encode_cursor(row):
+    return f'{row.created_at.isoformat()}_{row.id}'
+
+
+def _decode_cursor(cursor):
+    try:
+        created_at, comment_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def pending_queue(project_id=None, before=None, cursor=None, limit=50):
+    """Oldest-first page of pending comments; returns ``(rows, next_cursor)``"""
+    query = db.session.query(
+        ProjectComment.id, ProjectComment.project_id, ProjectComment.content,
+        ProjectComment.created_at, User.username, Project.title
+    ).join(User, User.id == ProjectComment.user_id).join(
+        Project, Project.id == ProjectComment.project_id
+    ).filter(*pending_criteria(project_id, before))
+
+    position = _decode_cursor(cursor)
+    if position:
+        query = query.filter(tuple_(ProjectComment.created_at, ProjectComment.id) > position)
+
+    rows = query.order_by(ProjectComment.created_at, ProjectComment.id).limit(limit + 1).all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def moderate(action, comment_ids=None, project_id=None, before=None):
+    """Approve or reject pending comments in one statement.
+
+    ``comment_ids=None`` applies the action to everything matching the filter.
+    Returns ``(affected, rankings)`` where ``rankings`` are the updated
+    ``ProjectRanking`` rows of projects that gained approved comments.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f'Unknown moderation action: {action}')
+    criteria = pending_criteria(project_id, before)
+    if comment_ids is not None:
+        criteria.append(ProjectComment.id.in_(comment_ids))
+
+    try:
+        if action == 'approve':
+            stmt = update(ProjectComment).where(*criteria).values(is_approved=True)
+            if db.engine.dialect.update_returning:
+                rows = db.session.execute(
+                    stmt.returning(ProjectComment.project_id, ProjectComment.created_at),
+                    execution_options={'synchronize_session': False}).all()
+            else:
+                rows = db.session.execute(
+                    select(ProjectComment.project_id, ProjectComment.created_at).where(*criteria)).all()
+                db.session.execute(stmt, execution_options={'synchronize_session': False})
+            rankings = ranking.record_comment_batch(rows)
+            affected = len(rows)
+        else:
+            # Pending comments are not counted anywhere, so rejecting needs no counter update
+            result = db.session.execute(delete(ProjectComment).where(*criteria),
+                                        execution_options={'synchronize_session': False})
+            rankings = []
+            affected = result.rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return affected, rankings
@@ -0,0 +1,72 @@
+"""Read-only public JSON endpoints, shared by the Flask routes and asgi.py.
+
+Each endpoint is a Core ``select()`` plus an encoder from the fetched rows to
+response bytes, so the sync path (Flask-SQLAlchemy session) and the async
+path (``AsyncConnection``) run the same SQL and return identical JSON.
+"""
+from sqlalchemy import func, select
+
+from models import Project, ProjectComment, ProjectRanking
+import ranking
+from serializers import CommentDTO, ProjectDTO, dumps_bytes, encode_rows
+
+NOT_FOUND = dumps_bytes({'error': 'Projeto não encontrado'})
+
+_likes = func.coalesce(ProjectRanking.likes_count, 0)
+_comments = func.coalesce(ProjectRanking.comments_count, 0)
+
+
+def _with_ranking(*columns):
+    return select(*columns).outerjoin(ProjectRanking, ProjectRanking.project_id == Project.id)
+
+
+def project_list_statement(category='all', sort=None):
+    """``/api/projects``: optionally filtered by category, ordered by priority or ranking"""
+    if sort in ('trending', 'popular'):
+        statement = _with_ranking(*ProjectDTO.columns).order_by(*ranking.ranking_order(sort))
+    else:
+        statement = select(*ProjectDTO.columns).order_by(Project.order_priority.desc())
+    if category and category != 'all':
+        statement = statement.where(Project.category == category)
+    return statement
+
+
+def encode_project_list(rows):
+    return encode_rows(ProjectDTO, rows)
+
+
+def project_statement(project_id):
+    """One project with its counters; no row when it doesn't exist"""
+    return _with_ranking(*ProjectDTO.columns, _likes, _comments).where(Project.id == project_id)
+
+
+def comments_statement(project_id):
+    return select(*CommentDTO.columns).where(
+        ProjectComment.project_id == project_id, ProjectComment.is_approved.is_(True)
+    ).order_by(ProjectComment.created_at.desc())
+
+
+def encode_project_detail(project_row, comment_rows):
+    fields = len(ProjectDTO.columns)
+    data = ProjectDTO(project_row[:fields]).to_dict()
+    data['likes_count'], data['comments_count'] = project_row[fields:]
+    data['comments'] = [CommentDTO(row).to_dict() for row in comment_rows]
+    return dumps_bytes(data)
+
+
+def counts_statement():
+    """Like and comment counters of every project that has a ranking row"""
+    return select(ProjectRanking.project_id, ProjectRanking.likes_count, ProjectRanking.comments_count)
+
+
+def encode_counts(rows):
+    return dumps_bytes([{'project_id': project_id, 'likes': likes, 'comments': comments}
+                        for project_id, likes, comments in rows])
+
+
+def likes_statement(project_id):
+    return _with_ranking(Project.id, _likes).where(Project.id == project_id)
+
+
+def encode_likes(row):
+    return dumps_bytes({'project_id': row[0], 'likes_count': row[1]})
@@ -0,0 +1,171 @@
+"""Incrementally maintained project rankings.
+
+Every like and approved comment adds ``weight * 2 ** ((created_at - EPOCH) / half_life)``
+to its project's score. Because all contributions share the same epoch, the
+relative order of projects never changes as time passes, so the score can be
+stored once and sorted by the database. Scores are kept in log2 space
+(``ProjectRanking.trending_key``) to avoid float overflow.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from models import Project, ProjectLike, ProjectComment, ProjectRanking
+
+EPOCH = datetime(2024, 1, 1)
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+
+
+def _half_life_seconds():
+    return current_app.config.get('TRENDING_HALF_LIFE_DAYS', 7) * 86400
+
+
+def _event_key(created_at, weight):
+    """log2 contribution of a single event"""
+    return (created_at - EPOCH).total_seconds() / _half_life_seconds() + math.log2(weight)
+
+
+def _log2_add(key, other):
+    if key is None:
+        return other
+    high, low = max(key, other), min(key, other)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def _log2_sub(key, other):
+    if key is None or other >= key:
+        return None
+    return key + math.log2(1 - 2 ** (other - key))
+
+
+def _create_ranking(project_id):
+    """Insert an empty ranking row unless another transaction already has"""
+    values = {'project_id': project_id, 'likes_count': 0, 'comments_count': 0}
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        db.session.execute(insert(ProjectRanking).values(values).on_conflict_do_nothing(
+            index_elements=['project_id']))
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(ProjectRanking.__table__.insert().values(values))
+    except IntegrityError:
+        pass
+
+
+def _ranking_for(project_id):
+    query = ProjectRanking.query.filter_by(project_id=project_id).with_for_update()
+    ranking = query.first()
+    if ranking is None:
+        # Concurrent first likes/comments both get here; only one insert wins
+        _create_ranking(project_id)
+        ranking = query.one()
+    return ranking
+
+
+def _adjust(ranking, created_ats, weight, delta, counter):
+    setattr(ranking, counter, max(getattr(ranking, counter) + delta * len(created_ats), 0))
+    for created_at in created_ats:
+        key = _event_key(created_at, weight)
+        if delta > 0:
+            ranking.trending_key = _log2_add(ranking.trending_key, key)
+        else:
+            ranking.trending_key = _log2_sub(ranking.trending_key, key)
+    if not ranking.likes_count and not ranking.comments_count:
+        ranking.trending_key = None
+    return ranking
+
+
+def _apply(event, weight, delta, counter):
+    if event.created_at is None:
+        # Pin the timestamp now so a later removal subtracts the exact same amount
+        event.created_at = datetime.utcnow()
+    return _adjust(_ranking_for(event.project_id), [event.created_at], weight, delta, counter)
+
+
+def record_like(like, delta=1):
+    """Account for a like being added (delta=1) or removed (delta=-1); call before commit"""
+    return _apply(like, LIKE_WEIGHT, delta, 'likes_count')
+
+
+def record_comment(comment, delta=1):
+    """Account for an approved comment appearing or disappearing; call before commit"""
+    return _apply(comment, COMMENT_WEIGHT, delta, 'comments_count')
+
+
+def record_comment_batch(rows, delta=1):
+    """Bulk version of record_comment for ``(project_id, created_at)`` rows; one row lock per project"""
+    by_project = defaultdict(list)
+    for project_id, created_at in rows:
+        by_project[project_id].append(created_at)
+    return [_adjust(_ranking_for(project_id), created_ats, COMMENT_WEIGHT, delta, 'comments_count')
+            for project_id, created_ats in by_project.items()]
+
+
+def trending_score(ranking, now=None):
+    """Decayed score of a ranking row at ``now``"""
+    if ranking is None or ranking.trending_key is None:
+        return 0.0
+    now = now or datetime.utcnow()
+    return 2 ** (ranking.trending_key - (now - EPOCH).total_seconds() / _half_life_seconds())
+
+
+def ranking_order(sort='trending'):
+    """ORDER BY clauses for a query outer-joined to ProjectRanking"""
+    if sort == 'popular':
+        primary = ProjectRanking.likes_count.desc().nulls_last()
+    else:
+        primary = ProjectRanking.trending_key.desc().nulls_last()
+    return primary, Project.order_priority.desc()
+
+
+def ranked_projects(sort='trending', category=None):
+    """Query of projects ordered by trending score or total likes"""
+    query = Project.query.outerjoin(ProjectRanking)
+    if category and category != 'all':
+        query = query.filter(Project.category == category)
+    return query.order_by(*ranking_order(sort))
+
+
+def rebuild_rankings():
+    """Recompute every ranking row from the likes and comments tables"""
+    rankings = {}
+
+    def row(project_id):
+        if project_id not in rankings:
+            rankings[project_id] = {'likes_count': 0, 'comments_count': 0, 'trending_key': None}
+        return rankings[project_id]
+
+    likes = db.session.query(ProjectLike.project_id, ProjectLike.created_at).yield_per(1000)
+    for project_id, created_at in likes:
+        entry = row(project_id)
+        entry['likes_count'] += 1
+        entry['trending_key'] = _log2_add(entry['trending_key'], _event_key(created_at, LIKE_WEIGHT))
+
+    comments = db.session.query(ProjectComment.project_id, ProjectComment.created_at).filter_by(
+        is_approved=True).yield_per(1000)
+    for project_id, created_at in comments:
+        entry = row(project_id)
+        entry['comments_count'] += 1
+        entry['trending_key'] = _log2_add(entry['trending_key'], _event_key(created_at, COMMENT_WEIGHT))
+
+    ProjectRanking.query.delete()
+    db.session.add_all(ProjectRanking(project_id=project_id, **values)
+                       for project_id, values in rankings.items())
+    db.session.commit()
+    return len(rankings)
+
+
+def ensure_rankings():
+    """Backfill the rankings table the first time the app runs with it"""
+    if ProjectRanking.query.first() is not None:
+        return
+    if ProjectLike.query.first() is not None or ProjectComment.query.first() is not None:
+        rebuild_rankings()
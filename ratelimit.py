@@ -0,0 +1,150 @@
+"""Token-bucket rate limiting for write endpoints.
+
+Each bucket holds up to ``limit`` tokens and refills at ``limit / period``
+tokens per second; a request spends one token. Buckets live in a pluggable
+store: ``MemoryStore`` for a single process, ``SQLiteStore`` to share limits
+between workers through one atomic UPSERT per request.
+"""
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryStore:
+    """Buckets kept in a dict guarded by a lock"""
+
+    def __init__(self, max_keys=100000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def consume(self, key, capacity, rate, now):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._max_keys:
+                    self._prune(now)
+                self._buckets[key] = [capacity - 1.0, now]
+                return True
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            if tokens < 1.0:
+                return False
+            bucket[0] = tokens - 1.0
+            bucket[1] = now
+            return True
+
+    def _prune(self, now, idle_seconds=3600):
+        stale = [key for key, (_, updated) in self._buckets.items() if now - updated > idle_seconds]
+        for key in stale:
+            del self._buckets[key]
+        if len(self._buckets) >= self._max_keys:
+            self._buckets.clear()
+
+
+class SQLiteStore:
+    """Buckets shared between worker processes in a SQLite file"""
+
+    # Refill and spend in one statement; no row comes back when the bucket is empty
+    _CONSUME_SQL = (
+        'INSERT INTO buckets (key, tokens, updated_at) VALUES (?1, ?2 - 1, ?4) '
+        'ON CONFLICT(key) DO UPDATE SET '
+        'tokens = MIN(?2, tokens + (?4 - updated_at) * ?3) - 1, updated_at = ?4 '
+        'WHERE MIN(?2, tokens + (?4 - updated_at) * ?3) >= 1 '
+        'RETURNING tokens'
+    )
+
+    def __init__(self, path, prune_every=10000):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        self._prune_every = prune_every
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Losing a few buckets on power failure is harmless
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key, capacity, rate, now):
+        conn = self._connection()
+        allowed = conn.execute(self._CONSUME_SQL, (key, capacity, rate, now)).fetchone() is not None
+        self._calls += 1
+        if self._calls % self._prune_every == 0:
+            conn.execute('DELETE FROM buckets WHERE updated_at < ?', (now - 3600,))
+        return allowed
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(app):
+    """Return the process-wide store selected by ``RATELIMIT_STORAGE``"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if app.config.get('RATELIMIT_STORAGE') == 'sqlite':
+                    path = app.config.get('RATELIMIT_SQLITE_PATH') or os.path.join(
+                        app.instance_path, 'ratelimit.db')
+                    _store = SQLiteStore(path)
+                else:
+                    _store = MemoryStore()
+    return _store
+
+
+def _client_key(scope):
+    if scope == 'user' and current_user.is_authenticated:
+        return f'user:{current_user.id}'
+    return f'ip:{request.remote_addr}'
+
+
+def rate_limit(limit, period=60, scope='ip', methods=('POST',)):
+    """Decorator allowing ``limit`` requests per ``period`` seconds per client
+
+    ``scope`` is ``'ip'`` or ``'user'`` (falls back to the IP for anonymous
+    visitors). Stack several decorators to combine limits.
+    """
+    rate = limit / period
+    retry_after = math.ceil(1 / rate)
+
+    def decorator(f):
+        bucket_prefix = f'{f.__name__}:{scope}:'
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method in methods and current_app.config.get('RATELIMIT_ENABLED', True):
+                key = bucket_prefix + _client_key(scope)
+                try:
+                    allowed = get_store(current_app).consume(key, float(limit), rate, time.time())
+                except sqlite3.Error as e:
+                    # Fail open: a broken limiter must not take the site down
+                    logger.error("Rate limit store error: %s", e)
+                    allowed = True
+                if not allowed:
+                    raise TooManyRequests(retry_after=retry_after)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,251 @@
+"""Live like and comment counters pushed to browsers over Server-Sent Events.
+
+Writes call ``publish_counts()``; the configured backend delivers the event to
+the in-process ``Hub`` of every worker, which fans it out to the connected
+``Subscription`` buffers consumed by ``event_stream()``.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Bounded per-client buffer that coalesces updates by project"""
+
+    def __init__(self, max_pending=256):
+        self._pending = OrderedDict()
+        self._max_pending = max_pending
+        self._cond = threading.Condition()
+        self.closed = False
+        self.overflowed = False
+
+    def push(self, event_id, event):
+        with self._cond:
+            if self.closed:
+                return
+            key = event['project_id']
+            if key not in self._pending and len(self._pending) >= self._max_pending:
+                # Client is too far behind; drop it so it reconnects and resyncs
+                self.overflowed = True
+                self.closed = True
+                self._pending.clear()
+            else:
+                # Counts are absolute, so the newest event for a project wins
+                self._pending[key] = (event_id, event)
+            self._cond.notify()
+
+    def drain(self, timeout):
+        """Wait for pending events; returns None on timeout"""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            if not self._pending:
+                return [] if self.closed else None
+            events = list(self._pending.values())
+            self._pending.clear()
+            return events
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class Hub:
+    """In-process pub/sub fan-out to every open SSE connection"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def subscribe(self, max_pending=256):
+        subscription = Subscription(max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def fan_out(self, event):
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.push(event_id, event)
+
+    @property
+    def last_id(self):
+        with self._lock:
+            return self._last_id
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+class LocalBackend:
+    """Single-process backend: events go straight to the local hub"""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def start(self):
+        pass
+
+    def publish(self, event):
+        self.hub.fan_out(event)
+
+
+class SQLiteChangeLogBackend:
+    """Multi-worker backend: a shared SQLite change log polled by each worker"""
+
+    def __init__(self, hub, path, poll_interval=0.5, retention_seconds=300):
+        self.hub = hub
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS change_log ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'created_at REAL NOT NULL, '
+            'payload TEXT NOT NULL)'
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='realtime-poller', daemon=True)
+            self._thread.start()
+
+    def publish(self, event):
+        self._connection().execute(
+            'INSERT INTO change_log (created_at, payload) VALUES (?, ?)',
+            (time.time(), json.dumps(event, separators=(',', ':')))
+        )
+
+    def _run(self):
+        conn = self._connection()
+        last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM change_log').fetchone()[0]
+        last_prune = time.monotonic()
+        while True:
+            try:
+                rows = conn.execute(
+                    'SELECT id, payload FROM change_log WHERE id > ? ORDER BY id',
+                    (last_id,)
+                ).fetchall()
+                for row_id, payload in rows:
+                    last_id = row_id
+                    self.hub.fan_out(json.loads(payload))
+
+                if time.monotonic() - last_prune > self.retention_seconds:
+                    conn.execute(
+                        'DELETE FROM change_log WHERE created_at < ?',
+                        (time.time() - self.retention_seconds,)
+                    )
+                    last_prune = time.monotonic()
+            except sqlite3.Error as e:
+                logger.error("Realtime change log poll failed: %s", e)
+            time.sleep(self.poll_interval)
+
+
+hub = Hub()
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend(app):
+    """Return the process-wide backend selected by ``REALTIME_BACKEND``"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = app.config.get('REALTIME_BACKEND', 'local')
+                if name == 'sqlite':
+                    path = app.config.get('REALTIME_CHANGELOG_PATH') or os.path.join(
+                        app.instance_path, 'realtime.db')
+                    backend = SQLiteChangeLogBackend(hub, path)
+                else:
+                    backend = LocalBackend(hub)
+                backend.start()
+                _backend = backend
+    return _backend
+
+
+def publish_counts(app, project_id, likes_count, comments_count):
+    """Broadcast the current counters of a project to all listeners"""
+    try:
+        get_backend(app).publish({
+            'project_id': project_id,
+            'likes': likes_count,
+            'comments': comments_count,
+        })
+    except Exception as e:
+        # Live updates are best effort; never fail the write that triggered them
+        logger.error("Error publishing realtime update: %s", e)
+
+
+def _format_event(name, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {name}')
+    lines.append('data: ' + json.dumps(data, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(subscription, snapshot=None, heartbeat=15.0, coalesce_window=0.25, max_age=60.0):
+    """Yield SSE frames for a subscription until the client goes away or
+    ``max_age`` seconds have passed.
+
+    Closing after ``max_age`` bounds how long one client holds a worker
+    thread. The first frame carries an event id, so EventSource always
+    reconnects with ``Last-Event-ID`` and gets a fresh snapshot.
+    """
+    deadline = time.monotonic() + max_age
+    try:
+        yield f'retry: 3000\nid: {hub.last_id}\n\n'
+        if snapshot is not None:
+            yield _format_event('snapshot', snapshot)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            events = subscription.drain(min(heartbeat, remaining))
+            if events is None:
+                yield ': keep-alive\n\n'
+                continue
+            if not events:
+                break
+            for event_id, event in events:
+                yield _format_event('counts', event, event_id)
+            # Give bursts of writes a moment to merge into the next batch
+            time.sleep(coalesce_window)
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,240 @@
+"""Retention of contact messages and comments.
+
+Read contacts and approved comments older than the configured age are moved
+out of the hot tables into append-only NDJSON segment files. Every archived
+batch is written as one compressed member (zstd when ``zstandard`` is
+installed, gzip otherwise) and recorded in a small SQLite offset index, so a
+record can be fetched by reading and decompressing a single member.
+
+A batch is appended and indexed before it is deleted from the hot table; a
+crash in between can only leave a duplicate in the archive (readers keep the
+last copy), never lose a record.
+"""
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from models import Contact, ProjectComment, User, Project
+from static_export import refresh_static_export
+import ranking
+import realtime
+
+try:
+    import zstandard
+except ImportError:  # Optional; gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('contact', 'comment')
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+_write_lock = threading.Lock()
+
+
+def _compress(data):
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'gzip', gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec, data):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('Archive member is zstd-compressed but zstandard is not installed')
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class Archive:
+    """Segment files plus their offset index in one directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(directory, 'index.db'), timeout=10)
+        self._index.execute(
+            'CREATE TABLE IF NOT EXISTS members ('
+            'id INTEGER PRIMARY KEY, kind TEXT NOT NULL, segment TEXT NOT NULL, '
+            'offset INTEGER NOT NULL, length INTEGER NOT NULL, codec TEXT NOT NULL, '
+            'first_id INTEGER NOT NULL, last_id INTEGER NOT NULL, '
+            'first_created TEXT, last_created TEXT, count INTEGER NOT NULL)'
+        )
+        self._index.execute('CREATE INDEX IF NOT EXISTS ix_members_kind_ids '
+                            'ON members (kind, first_id, last_id)')
+        self._index.commit()
+
+    def close(self):
+        self._index.close()
+
+    def _current_segment(self, kind):
+        row = self._index.execute(
+            'SELECT segment FROM members WHERE kind = ? ORDER BY id DESC LIMIT 1', (kind,)).fetchone()
+        if row and os.path.getsize(os.path.join(self.directory, row[0])) < SEGMENT_MAX_BYTES:
+            return row[0]
+        count = self._index.execute(
+            'SELECT COUNT(DISTINCT segment) FROM members WHERE kind = ?', (kind,)).fetchone()[0]
+        return f'{kind}-{count + 1:06d}.ndjson.seg'
+
+    def append(self, kind, records):
+        """Append ``records`` (dicts with id/created_at) as one compressed member"""
+        payload = b''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+                           for record in records)
+        codec, data = _compress(payload)
+        with _write_lock:
+            segment = self._current_segment(kind)
+            path = os.path.join(self.directory, segment)
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._index.execute(
+                'INSERT INTO members (kind, segment, offset, length, codec, first_id, last_id, '
+                'first_created, last_created, count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (kind, segment, offset, len(data), codec,
+                 min(r['id'] for r in records), max(r['id'] for r in records),
+                 min(r['created_at'] for r in records), max(r['created_at'] for r in records),
+                 len(records)))
+            self._index.commit()
+
+    def _read_member(self, segment, offset, length, codec):
+        with open(os.path.join(self.directory, segment), 'rb') as f:
+            f.seek(offset)
+            data = _decompress(codec, f.read(length))
+        return [json.loads(line) for line in data.splitlines() if line]
+
+    def get(self, kind, record_id):
+        """Fetch one archived record by its original id"""
+        members = self._index.execute(
+            'SELECT segment, offset, length, codec FROM members '
+            'WHERE kind = ? AND first_id <= ? AND last_id >= ? ORDER BY id DESC',
+            (kind, record_id, record_id)).fetchall()
+        for member in members:
+            for record in self._read_member(*member):
+                if record['id'] == record_id:
+                    return record
+        return None
+
+    def search(self, kind, query=None, limit=100):
+        """Newest-first records whose text fields contain ``query``"""
+        needle = (query or '').casefold()
+        members = self._index.execute(
+            'SELECT segment, offset, length, codec FROM members WHERE kind = ? ORDER BY id DESC',
+            (kind,)).fetchall()
+        results, seen = [], set()
+        for member in members:
+            for record in reversed(self._read_member(*member)):
+                if record['id'] in seen:
+                    continue
+                seen.add(record['id'])
+                if needle and not any(needle in str(value).casefold()
+                                      for value in record.values() if isinstance(value, str)):
+                    continue
+                results.append(record)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def stats(self):
+        return {kind: self._index.execute(
+            'SELECT COALESCE(SUM(count), 0) FROM members WHERE kind = ?', (kind,)).fetchone()[0]
+            for kind in KINDS}
+
+
+def open_archive():
+    return Archive(current_app.config.get('ARCHIVE_DIR') or
+                   os.path.join(current_app.instance_path, 'archive'))
+
+
+def _contact_batch(cutoff, batch_size):
+    rows = db.session.query(Contact.id, Contact.name, Contact.email, Contact.subject,
+                            Contact.message, Contact.created_at).filter(
+        Contact.is_read.is_(True), Contact.created_at < cutoff
+    ).order_by(Contact.id).limit(batch_size).all()
+    return [{'id': r.id, 'name': r.name, 'email': r.email, 'subject': r.subject,
+             'message': r.message, 'created_at': r.created_at.isoformat()} for r in rows]
+
+
+def _comment_batch(cutoff, batch_size):
+    rows = db.session.query(ProjectComment.id, ProjectComment.project_id, ProjectComment.user_id,
+                            ProjectComment.content, ProjectComment.created_at,
+                            User.username, Project.title).join(
+        User, User.id == ProjectComment.user_id).join(
+        Project, Project.id == ProjectComment.project_id).filter(
+        ProjectComment.is_approved.is_(True), ProjectComment.created_at < cutoff
+    ).order_by(ProjectComment.id).limit(batch_size).all()
+    return [{'id': r.id, 'project_id': r.project_id, 'user_id': r.user_id, 'username': r.username,
+             'project_title': r.title, 'content': r.content,
+             'created_at': r.created_at.isoformat()} for r in rows]
+
+
+def _eligible(kind, cutoff):
+    if kind == 'contact':
+        return Contact.query.filter(Contact.is_read.is_(True), Contact.created_at < cutoff)
+    return ProjectComment.query.filter(ProjectComment.is_approved.is_(True),
+                                       ProjectComment.created_at < cutoff)
+
+
+def archive_old_records(contact_days=None, comment_days=None, batch_size=None, pause=None, dry_run=False):
+    """Move eligible rows into the archive in small batches; returns counts per kind"""
+    config = current_app.config
+    contact_days = contact_days if contact_days is not None else config.get('RETENTION_CONTACT_DAYS', 90)
+    comment_days = comment_days if comment_days is not None else config.get('RETENTION_COMMENT_DAYS', 365)
+    batch_size = batch_size or config.get('RETENTION_BATCH_SIZE', 500)
+    pause = pause if pause is not None else config.get('RETENTION_BATCH_PAUSE', 0.05)
+
+    now = datetime.utcnow()
+    jobs = (
+        ('contact', Contact, _contact_batch, now - timedelta(days=contact_days)),
+        ('comment', ProjectComment, _comment_batch, now - timedelta(days=comment_days)),
+    )
+    counts = {kind: 0 for kind in KINDS}
+    if dry_run:
+        for kind, _, _, cutoff in jobs:
+            counts[kind] = _eligible(kind, cutoff).count()
+        return counts
+
+    archive = open_archive()
+    try:
+        for kind, model, fetch_batch, cutoff in jobs:
+            while True:
+                records = fetch_batch(cutoff, batch_size)
+                if not records:
+                    break
+                archive.append(kind, records)
+
+                ids = [record['id'] for record in records]
+                rankings = []
+                if kind == 'comment':
+                    rankings = ranking.record_comment_batch(
+                        [(record['project_id'], datetime.fromisoformat(record['created_at']))
+                         for record in records], -1)
+                model.query.filter(model.id.in_(ids)).delete(synchronize_session=False)
+                db.session.commit()
+                counts[kind] += len(records)
+
+                # Archived comments disappear from the detail pages and their counters
+                for project_ranking in rankings:
+                    realtime.publish_counts(current_app._get_current_object(), project_ranking.project_id,
+                                            project_ranking.likes_count, project_ranking.comments_count)
+                if rankings:
+                    refresh_static_export(project_ids=[r.project_id for r in rankings], index=False)
+
+                # Short transactions with a pause keep writers from queueing behind us
+                time.sleep(pause)
+    except Exception:
+        db.session.rollback()
+        logger.exception("Archiving stopped early")
+        raise
+    finally:
+        archive.close()
+    return counts
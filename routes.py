@@ -1,14 +1,28 @@
-from flask import render_template, request, jsonify, flash, redirect, url_for, abort, session
+from flask import render_template, request, jsonify, flash, redirect, url_for, abort, session, Response, stream_with_context
 from flask_login import login_user, logout_user, login_required, current_user
+from flask_wtf.csrf import generate_csrf, validate_csrf
+from wtforms.validators import ValidationError
 from app import app, db
-from models import Project, Skill, Experience, Contact, User, ProjectLike, ProjectComment
-from forms import ContactForm, LoginForm, RegisterForm, CommentForm, ProjectForm, SkillForm
+from models import Project, Skill, Experience, Contact, User, ProjectLike, ProjectComment, ProjectRanking
+from forms import ContactForm, LoginForm, RegisterForm, CommentForm, ModerationForm, ProjectForm, SkillForm
 from functools import wraps
 import logging
 import os
 import secrets
-from PIL import Image
 from werkzeug.utils import secure_filename
+import realtime
+import ranking
+from ratelimit import rate_limit
+from viewmodels import build_project_cards, split_technologies
+from sections import index_sections, invalidate_sections
+from static_export import refresh_static_export
+import bulk
+import retention
+import moderation
+import uploads
+import public_api
+
+logger = logging.getLogger(__name__)
 
 def admin_required(f):
     """Decorator to require admin access"""
@@ -24,10 +38,8 @@ def save_picture(form_picture, folder='projects'):
     if not form_picture:
         return None
     
-    # Generate random filename
-    random_hex = secrets.token_hex(8)
-    _, f_ext = os.path.splitext(form_picture.filename)
-    picture_fn = random_hex + f_ext
+    # Generate random filename (always re-encoded as JPEG)
+    picture_fn = secrets.token_hex(8) + '.jpg'
     
     # Create upload folder if it doesn't exist
     upload_folder = os.path.join(app.root_path, 'static', 'uploads', folder)
@@ -35,28 +47,37 @@ def save_picture(form_picture, folder='projects'):
     
     picture_path = os.path.join(upload_folder, picture_fn)
     
-    # Resize and save image
+    # Resize image for optimization
+    if folder == 'projects':
+        output_size = (800, 600)
+    else:
+        output_size = (400, 400)
+    
+    # Validate from the header, then resize and save; UploadError propagates
     try:
-        img = Image.open(form_picture)
-        
-        # Resize image for optimization
-        if folder == 'projects':
-            output_size = (800, 600)
-        else:
-            output_size = (400, 400)
-            
-        # Convert to RGB if needed (for PNG with transparency)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            img = img.convert('RGB')
-            
-        img.thumbnail(output_size, Image.Resampling.LANCZOS)
-        img.save(picture_path, 'JPEG', quality=90, optimize=True)
-        
+        uploads.save_image(form_picture.stream, picture_path, output_size,
+                           app.config['UPLOAD_MAX_BYTES'], app.config['UPLOAD_MAX_PIXELS'])
         return f'uploads/{folder}/{picture_fn}'
     except Exception as e:
-        logging.error(f"Error processing image: {e}")
+        if os.path.exists(picture_path):
+            os.remove(picture_path)
+        if isinstance(e, uploads.UploadError):
+            raise
+        logger.error("Error processing image: %s", e)
         return None
 
+def publish_project_counts(project_ranking):
+    """Push the committed like/comment counters of a project to live listeners"""
+    realtime.publish_counts(app, project_ranking.project_id,
+                            project_ranking.likes_count, project_ranking.comments_count)
+
+def publish_moderated(rankings):
+    """Push new comment counters and re-export the detail pages of moderated projects"""
+    for project_ranking in rankings:
+        publish_project_counts(project_ranking)
+    if rankings:
+        refresh_static_export(project_ids=[r.project_id for r in rankings], index=False)
+
 def delete_picture(picture_path):
     """Delete picture file"""
     if picture_path and picture_path.startswith('uploads/'):
@@ -65,35 +86,33 @@ def delete_picture(picture_path):
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
-            logging.error(f"Error deleting image: {e}")
+            logger.error("Error deleting image: %s", e)
 
 @app.route('/')
 def index():
     """Main portfolio page"""
-    # Get featured projects
-    featured_projects = Project.query.filter_by(featured=True).order_by(Project.order_priority.desc()).limit(6).all()
-    
-    # Get all projects for portfolio section
-    all_projects = Project.query.order_by(Project.order_priority.desc()).all()
-    
-    # Get skills grouped by category
-    frontend_skills = Skill.query.filter_by(category='frontend').order_by(Skill.order_priority.desc()).all()
-    backend_skills = Skill.query.filter_by(category='backend').order_by(Skill.order_priority.desc()).all()
-    tools_skills = Skill.query.filter_by(category='tools').order_by(Skill.order_priority.desc()).all()
+    # Get all projects for portfolio section, with likes resolved up front
+    all_projects = build_project_cards(
+        Project.query.order_by(Project.order_priority.desc()).all(),
+        current_user
+    )
     
+    # Skills grouped by category and the experience timeline (cached snapshot)
+    sections = index_sections()
     
     # Create contact form
     contact_form = ContactForm()
+    comment_form = CommentForm()
     
     return render_template('index.html',
-                         featured_projects=featured_projects,
                          all_projects=all_projects,
-                         frontend_skills=frontend_skills,
-                         backend_skills=backend_skills,
-                         tools_skills=tools_skills,
-                         contact_form=contact_form)
+                         skill_groups=sections.skill_groups,
+                         experiences=sections.experiences,
+                         contact_form=contact_form,
+                         comment_form=comment_form)
 
 @app.route('/contact', methods=['POST'])
+@rate_limit(5, period=600)
 def contact():
     """Handle contact form submission"""
     form = ContactForm()
@@ -112,12 +131,13 @@ def contact():
             db.session.commit()
             
             flash('Mensagem enviada com sucesso! Retornarei em breve.', 'success')
-            logging.info(f"New contact message from {form.name.data} ({form.email.data})")
+            logger.info("New contact message from %s (%s)", form.name.data, form.email.data,
+                        extra={'contact_id': contact_entry.id})
             
         except Exception as e:
             db.session.rollback()
             flash('Erro ao enviar mensagem. Tente novamente.', 'error')
-            logging.error(f"Error saving contact message: {e}")
+            logger.exception("Error saving contact message: %s", e)
     
     else:
         # Return validation errors
@@ -130,34 +150,118 @@ def contact():
 @app.route('/api/projects')
 def api_projects():
     """API endpoint for projects (for filtering)"""
-    category = request.args.get('category', 'all')
+    statement = public_api.project_list_statement(request.args.get('category', 'all'),
+                                                  request.args.get('sort'))
     
-    if category == 'all':
-        projects = Project.query.order_by(Project.order_priority.desc()).all()
-    else:
-        projects = Project.query.filter_by(category=category).order_by(Project.order_priority.desc()).all()
-    
-    projects_data = []
-    for project in projects:
-        projects_data.append({
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'short_description': project.short_description,
-            'technologies': project.technologies.split(',') if project.technologies else [],
-            'github_url': project.github_url,
-            'live_url': project.live_url,
-            'image_url': project.image_url,
-            'category': project.category
-        })
-    
-    return jsonify(projects_data)
+    # Plain column tuples; unchanged rows reuse their cached JSON bytes
+    rows = db.session.execute(statement).all()
+    return app.response_class(public_api.encode_project_list(rows), mimetype='application/json')
+
+@app.route('/api/projects/<int:project_id>')
+def api_project_detail(project_id):
+    """Project details with counters and approved comments"""
+    row = db.session.execute(public_api.project_statement(project_id)).first()
+    if row is None:
+        return app.response_class(public_api.NOT_FOUND, status=404, mimetype='application/json')
+    comments = db.session.execute(public_api.comments_statement(project_id)).all()
+    return app.response_class(public_api.encode_project_detail(row, comments), mimetype='application/json')
+
+@app.route('/api/projects/<int:project_id>/likes')
+def api_project_likes(project_id):
+    """Current like count of a project"""
+    row = db.session.execute(public_api.likes_statement(project_id)).first()
+    if row is None:
+        return app.response_class(public_api.NOT_FOUND, status=404, mimetype='application/json')
+    return app.response_class(public_api.encode_likes(row), mimetype='application/json')
+
+@app.route('/api/counts')
+def api_counts():
+    """Like and comment counters of every project, for statically exported pages"""
+    rows = db.session.execute(public_api.counts_statement()).all()
+    return app.response_class(public_api.encode_counts(rows), mimetype='application/json')
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events stream of live like and comment counters"""
+    if not app.config['REALTIME_STREAMING']:
+        # 204 tells EventSource not to reconnect
+        return '', 204
+
+    # Subscribe before reading the snapshot so no update falls between the
+    # two; counts are absolute, so one delivered twice is harmless
+    realtime.get_backend(app)
+    subscription = realtime.hub.subscribe()
+
+    snapshot = None
+    try:
+        if request.headers.get('Last-Event-ID') or request.args.get('snapshot'):
+            # Reconnecting clients and statically exported pages need every counter
+            snapshot = [
+                {'project_id': project_id, 'likes': likes, 'comments': comments}
+                for project_id, likes, comments in db.session.execute(public_api.counts_statement())
+            ]
+    except Exception:
+        realtime.hub.unsubscribe(subscription)
+        raise
+    finally:
+        db.session.remove()
+
+    return Response(realtime.event_stream(subscription, snapshot,
+                                          max_age=app.config['REALTIME_STREAM_SECONDS']),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/csrf-token')
+def api_csrf_token():
+    """CSRF token for forms on statically exported pages"""
+    response = jsonify({'csrf_token': generate_csrf()})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/me')
+def api_me():
+    """Visitor state for statically exported pages: login, liked projects and a CSRF token"""
+    data = {'authenticated': current_user.is_authenticated, 'csrf_token': generate_csrf()}
+    if current_user.is_authenticated:
+        data['liked'] = [project_id for (project_id,) in
+                         db.session.query(ProjectLike.project_id).filter_by(user_id=current_user.id)]
+    response = jsonify(data)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
     """404 error handler"""
     return render_template('index.html'), 404
 
+def error_response(status, title, message):
+    """JSON for API clients, otherwise an error page with the real status.
+
+    Browsers don't follow Location on a 4xx, so these can't redirect back.
+    """
+    if request.is_json or request.accept_mimetypes.best == 'application/json':
+        return jsonify({'error': message}), status
+    back_url = request.referrer
+    if not back_url or not back_url.startswith(request.host_url):
+        back_url = url_for('index')
+    return render_template('error.html', title=title, message=message, back_url=back_url), status
+
+@app.errorhandler(429)
+def too_many_requests(error):
+    """429 error handler"""
+    response = app.make_response(error_response(
+        429, 'Muitas tentativas', 'Muitas tentativas. Aguarde um momento e tente novamente.'))
+    if error.retry_after:
+        response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+@app.errorhandler(413)
+def request_entity_too_large(error):
+    """413 error handler for uploads over MAX_CONTENT_LENGTH"""
+    return error_response(
+        413, 'Arquivo muito grande',
+        f'Arquivo muito grande (máximo {app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)} MB).')
+
 @app.errorhandler(500)
 def internal_error(error):
     """500 error handler"""
@@ -266,10 +370,11 @@ def create_sample_data():
             db.session.add(experience)
         
         db.session.commit()
-        logging.info("Sample data created successfully")
+        logger.info("Sample data created successfully")
 
 # Authentication Routes
 @app.route('/login', methods=['GET', 'POST'])
+@rate_limit(10, period=60)
 def login():
     """User login"""
     if current_user.is_authenticated:
@@ -290,6 +395,7 @@ def login():
     return render_template('auth/login.html', form=form)
 
 @app.route('/register', methods=['GET', 'POST'])
+@rate_limit(5, period=600)
 def register():
     """User registration"""
     if current_user.is_authenticated:
@@ -323,6 +429,7 @@ def logout():
 # Project interaction routes
 @app.route('/project/<int:project_id>/like', methods=['POST'])
 @login_required
+@rate_limit(30, period=60, scope='user')
 def toggle_like(project_id):
     """Toggle project like"""
     project = Project.query.get_or_404(project_id)
@@ -333,22 +440,27 @@ def toggle_like(project_id):
     ).first()
     
     if existing_like:
+        project_ranking = ranking.record_like(existing_like, -1)
         db.session.delete(existing_like)
         liked = False
     else:
         new_like = ProjectLike(user_id=current_user.id, project_id=project_id)
         db.session.add(new_like)
+        project_ranking = ranking.record_like(new_like)
         liked = True
     
     db.session.commit()
     
+    publish_project_counts(project_ranking)
+    
     return jsonify({
         'liked': liked,
-        'likes_count': project.likes_count
+        'likes_count': project_ranking.likes_count
     })
 
 @app.route('/project/<int:project_id>/comment', methods=['POST'])
 @login_required
+@rate_limit(5, period=60, scope='user')
 def add_comment(project_id):
     """Add project comment"""
     project = Project.query.get_or_404(project_id)
@@ -360,11 +472,20 @@ def add_comment(project_id):
             project_id=project_id,
             content=form.content.data
         )
+        if app.config['COMMENTS_REQUIRE_APPROVAL']:
+            comment.is_approved = False
         
         db.session.add(comment)
+        db.session.flush()  # Apply column defaults such as is_approved
+        project_ranking = ranking.record_comment(comment) if comment.is_approved else None
         db.session.commit()
         
-        flash('Comentário adicionado com sucesso!', 'success')
+        if project_ranking:
+            publish_project_counts(project_ranking)
+            refresh_static_export(project_ids=[project_id], index=False)
+            flash('Comentário adicionado com sucesso!', 'success')
+        else:
+            flash('Comentário enviado para moderação.', 'info')
     else:
         for error in form.content.errors:
             flash(error, 'error')
@@ -384,6 +505,9 @@ def project_detail(project_id):
     
     return render_template('project_detail.html', 
                          project=project, 
+                         technologies=split_technologies(project.technologies),
+                         likes_count=project.ranking.likes_count if project.ranking else 0,
+                         comments_count=project.ranking.comments_count if project.ranking else 0,
                          comments=comments, 
                          comment_form=comment_form)
 
@@ -400,9 +524,9 @@ def admin_dashboard():
         'users': User.query.count(),
         'contacts': Contact.query.filter_by(is_read=False).count(),
         'total_contacts': Contact.query.count(),
-        'comments': ProjectComment.query.filter_by(is_approved=False).count(),
+        'comments': moderation.pending_count(),
         'total_comments': ProjectComment.query.count(),
-        'total_likes': ProjectLike.query.count(),
+        'total_likes': db.session.query(db.func.coalesce(db.func.sum(ProjectRanking.likes_count), 0)).scalar(),
         'skills': Skill.query.count()
     }
     
@@ -410,9 +534,9 @@ def admin_dashboard():
     recent_contacts = Contact.query.order_by(Contact.created_at.desc()).limit(5).all()
     recent_comments = ProjectComment.query.order_by(ProjectComment.created_at.desc()).limit(5).all()
     
-    # Get most liked projects
-    popular_projects = Project.query.join(ProjectLike).group_by(Project.id).order_by(
-        db.func.count(ProjectLike.id).desc()
+    # Get most liked projects from the materialized rankings
+    popular_projects = ranking.ranked_projects('popular').filter(
+        ProjectRanking.likes_count > 0
     ).limit(5).all()
     
     return render_template('admin/dashboard.html', 
@@ -440,7 +564,11 @@ def admin_new_project():
         # Handle image upload
         image_url = None
         if form.image.data:
-            image_url = save_picture(form.image.data, 'projects')
+            try:
+                image_url = save_picture(form.image.data, 'projects')
+            except uploads.UploadError as e:
+                flash(str(e), 'error')
+                return render_template('admin/project_form.html', form=form, title='Novo Projeto')
         
         project = Project(
             title=form.title.data,
@@ -457,6 +585,7 @@ def admin_new_project():
         
         db.session.add(project)
         db.session.commit()
+        refresh_static_export(project_ids=[project.id], api=True)
         
         flash('Projeto criado com sucesso!', 'success')
         return redirect(url_for('admin_projects'))
@@ -474,11 +603,19 @@ def admin_edit_project(project_id):
     if form.validate_on_submit():
         # Handle image upload
         if form.image.data:
-            # Delete old image if exists
+            try:
+                image_url = save_picture(form.image.data, 'projects')
+            except uploads.UploadError as e:
+                flash(str(e), 'error')
+                return render_template('admin/project_form.html', 
+                                     form=form, 
+                                     project=project, 
+                                     title='Editar Projeto')
+            
+            # Delete old image only once the new one is saved
             if project.image_url:
                 delete_picture(project.image_url)
-            
-            project.image_url = save_picture(form.image.data, 'projects')
+            project.image_url = image_url
         
         # Update project fields
         form.populate_obj(project)
@@ -486,6 +623,7 @@ def admin_edit_project(project_id):
         project.live_url = form.live_url.data or None
         
         db.session.commit()
+        refresh_static_export(project_ids=[project.id], api=True)
         
         flash('Projeto atualizado com sucesso!', 'success')
         return redirect(url_for('admin_projects'))
@@ -508,6 +646,7 @@ def admin_delete_project(project_id):
     
     db.session.delete(project)
     db.session.commit()
+    refresh_static_export(removed_project_ids=[project_id], api=True)
     
     flash('Projeto excluído com sucesso!', 'success')
     return redirect(url_for('admin_projects'))
@@ -538,6 +677,8 @@ def admin_new_skill():
         
         db.session.add(skill)
         db.session.commit()
+        invalidate_sections()
+        refresh_static_export()
         
         flash('Habilidade criada com sucesso!', 'success')
         return redirect(url_for('admin_skills'))
@@ -557,6 +698,8 @@ def admin_edit_skill(skill_id):
         skill.icon_class = form.icon_class.data or None
         
         db.session.commit()
+        invalidate_sections()
+        refresh_static_export()
         
         flash('Habilidade atualizada com sucesso!', 'success')
         return redirect(url_for('admin_skills'))
@@ -575,10 +718,47 @@ def admin_delete_skill(skill_id):
     
     db.session.delete(skill)
     db.session.commit()
+    invalidate_sections()
+    refresh_static_export()
     
     flash('Habilidade excluída com sucesso!', 'success')
     return redirect(url_for('admin_skills'))
 
+@app.route('/admin/export.ndjson')
+@login_required
+@admin_required
+def admin_export_ndjson():
+    """Stream projects, skills and experience as NDJSON"""
+    types = request.args.getlist('type') or None
+    return Response(stream_with_context(bulk.export_records(types)),
+                    mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=portfolio.ndjson'})
+
+@app.route('/admin/import', methods=['POST'])
+@login_required
+@admin_required
+def admin_import_ndjson():
+    """Bulk upsert NDJSON from an uploaded file or the raw request body"""
+    # Imports are streamed in chunks, so they get their own size cap
+    request.max_content_length = app.config['IMPORT_MAX_BYTES']
+    # Form uploads send csrf_token; raw bodies send the X-CSRFToken header
+    # (token from /api/csrf-token)
+    if app.config.get('WTF_CSRF_ENABLED', True):
+        try:
+            validate_csrf(request.form.get('csrf_token') or request.headers.get('X-CSRFToken'))
+        except ValidationError as e:
+            return jsonify({'error': f'Token CSRF inválido: {e}'}), 400
+    upload = request.files.get('file')
+    lines = upload.stream if upload else request.stream
+    
+    try:
+        counts = bulk.import_records(lines, batch_size=request.args.get('batch_size', 1000, type=int))
+    except bulk.NDJSONError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    logger.info("NDJSON import finished: %s", counts)
+    return jsonify(counts)
+
 @app.route('/admin/users')
 @login_required
 @admin_required
@@ -595,6 +775,42 @@ def admin_contacts():
     contacts = Contact.query.order_by(Contact.created_at.desc()).all()
     return render_template('admin/contacts.html', contacts=contacts)
 
+@app.route('/admin/archive')
+@login_required
+@admin_required
+def admin_archive():
+    """Search archived contacts and comments"""
+    kind = request.args.get('kind', 'contact')
+    if kind not in retention.KINDS:
+        abort(404)
+    query = request.args.get('q', '').strip()
+    
+    archive = retention.open_archive()
+    try:
+        records = archive.search(kind, query, limit=100)
+        stats = archive.stats()
+    finally:
+        archive.close()
+    
+    return render_template('admin/archive.html', kind=kind, query=query, records=records, stats=stats)
+
+@app.route('/admin/archive/<kind>/<int:record_id>')
+@login_required
+@admin_required
+def admin_archive_record(kind, record_id):
+    """View one archived record"""
+    if kind not in retention.KINDS:
+        abort(404)
+    archive = retention.open_archive()
+    try:
+        record = archive.get(kind, record_id)
+    finally:
+        archive.close()
+    if record is None:
+        abort(404)
+    return render_template('admin/archive.html', kind=kind, query='', records=[record], record=record,
+                           stats=None)
+
 @app.route('/admin/contact/<int:contact_id>/mark_read')
 @login_required
 @admin_required
@@ -611,12 +827,46 @@ def mark_contact_read(contact_id):
 @admin_required
 def approve_comment(comment_id):
     """Approve comment"""
-    comment = ProjectComment.query.get_or_404(comment_id)
-    comment.is_approved = True
-    db.session.commit()
+    ProjectComment.query.get_or_404(comment_id)
+    _, rankings = moderation.moderate('approve', [comment_id])
+    publish_moderated(rankings)
     flash('Comentário aprovado.', 'success')
     return redirect(url_for('admin_dashboard'))
 
+@app.route('/admin/moderation', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def admin_moderation():
+    """Pending comments queue with bulk approve/reject"""
+    project_id = request.args.get('project_id', type=int)
+    before = moderation.parse_before(request.args.get('before'))
+    form = ModerationForm()
+    
+    if form.validate_on_submit():
+        comment_ids = None
+        if form.scope.data != 'filter':
+            comment_ids = request.form.getlist('comment_ids', type=int)
+            if not comment_ids:
+                flash('Selecione ao menos um comentário.', 'warning')
+                return redirect(url_for('admin_moderation', **request.args))
+        affected, rankings = moderation.moderate(form.action.data, comment_ids, project_id, before)
+        publish_moderated(rankings)
+        verb = 'aprovado(s)' if form.action.data == 'approve' else 'rejeitado(s)'
+        flash(f'{affected} comentário(s) {verb}.', 'success')
+        return redirect(url_for('admin_moderation', project_id=project_id,
+                                before=request.args.get('before')))
+    
+    comments, next_cursor = moderation.pending_queue(project_id, before, cursor=request.args.get('after'))
+    projects = db.session.query(Project.id, Project.title).order_by(Project.title).all()
+    return render_template('admin/moderation.html',
+                         form=form,
+                         comments=comments,
+                         next_cursor=next_cursor,
+                         pending_count=moderation.pending_count(),
+                         projects=projects,
+                         project_id=project_id,
+                         before=request.args.get('before', ''))
+
 @app.route('/admin/create_admin')
 def create_admin_user():
     """Create admin user (development only)"""
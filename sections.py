@@ -0,0 +1,99 @@
+"""Cached skills and experience sections of the index page.
+
+Both sections are loaded with one query each, grouped in Python and kept as
+an immutable snapshot. The snapshot is shared until ``invalidate_sections()``
+touches a stamp file in the instance folder, which every worker checks with
+a single ``stat`` call per request.
+"""
+import os
+import threading
+from collections import namedtuple
+
+from flask import current_app
+
+from models import Skill, Experience
+
+SkillView = namedtuple('SkillView', 'name icon_class proficiency level')
+SkillGroup = namedtuple('SkillGroup', 'category title subtitle icon_class skills')
+ExperienceView = namedtuple('ExperienceView', 'position company company_url location description period')
+Sections = namedtuple('Sections', 'skill_groups experiences')
+
+# Headings for the known SkillForm categories, in display order
+CATEGORY_HEADINGS = {
+    'frontend': ('Frontend Development', 'Criando interfaces modernas e interativas', 'fas fa-palette'),
+    'backend': ('Backend Development', 'Construindo APIs robustas e escaláveis', 'fas fa-server'),
+    'tools': ('Ferramentas & DevOps', 'Otimizando fluxo de desenvolvimento', 'fas fa-tools'),
+    'database': ('Banco de Dados', 'Modelando e otimizando dados', 'fas fa-database'),
+    'design': ('Design', 'Experiências visuais e usabilidade', 'fas fa-pen-nib'),
+}
+
+_lock = threading.Lock()
+_cached = (None, None)  # (stamp, Sections), swapped as one tuple
+
+
+def _stamp_path():
+    return os.path.join(current_app.instance_path, 'sections.stamp')
+
+
+def _read_stamp():
+    try:
+        return os.stat(_stamp_path()).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _category_order(category):
+    known = list(CATEGORY_HEADINGS)
+    return (known.index(category), '') if category in known else (len(known), category)
+
+
+def _build():
+    groups = {}
+    skills = Skill.query.order_by(Skill.category, Skill.order_priority.desc()).all()
+    for skill in skills:
+        level = (skill.proficiency or 0) // 20
+        groups.setdefault(skill.category, []).append(
+            SkillView(skill.name, skill.icon_class, skill.proficiency, level))
+
+    skill_groups = []
+    for category in sorted(groups, key=_category_order):
+        title, subtitle, icon_class = CATEGORY_HEADINGS.get(
+            category, (category.replace('_', ' ').title(), '', 'fas fa-code'))
+        skill_groups.append(SkillGroup(category, title, subtitle, icon_class, tuple(groups[category])))
+
+    experiences = []
+    for experience in Experience.query.order_by(Experience.order_priority.desc(),
+                                                Experience.start_date.desc()).all():
+        end = experience.end_date.strftime('%m/%Y') if experience.end_date else 'Atual'
+        experiences.append(ExperienceView(
+            experience.position, experience.company, experience.company_url, experience.location,
+            experience.description, f"{experience.start_date.strftime('%m/%Y')} - {end}"))
+
+    return Sections(tuple(skill_groups), tuple(experiences))
+
+
+def index_sections():
+    """Return the current skills/experience snapshot, rebuilding it if stale"""
+    global _cached
+    stamp = _read_stamp()
+    cached_stamp, snapshot = _cached
+    if snapshot is not None and cached_stamp == stamp:
+        return snapshot
+    with _lock:
+        cached_stamp, snapshot = _cached
+        if snapshot is None or cached_stamp != stamp:
+            # Stamp is read before querying, so a concurrent commit forces another rebuild
+            snapshot = _build()
+            _cached = (stamp, snapshot)
+        return snapshot
+
+
+def invalidate_sections():
+    """Mark the snapshot stale in every worker; call after committing skill changes"""
+    global _cached
+    path = _stamp_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a'):
+        pass
+    os.utime(path)
+    _cached = (None, None)
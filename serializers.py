@@ -0,0 +1,176 @@
+"""Compact DTOs and cached JSON encoding for the public API.
+
+DTOs are built straight from column tuples (``Model.query.with_entities``)
+so no ORM instances are created. ``encode_rows`` keeps the encoded bytes of
+every row keyed by its id and a hash of its values: an unchanged row is never
+re-encoded, any edit produces a new key, and the cache holds only the bytes,
+not the row itself.
+
+orjson writes datetimes as ISO 8601 on its own while Flask's provider writes
+them as HTTP dates, so datetimes are passed through to Flask's ``default``
+and the output is the same with or without orjson. The DTOs format their
+dates with ``isoformat()`` themselves.
+"""
+import json
+import threading
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+from models import Project, Skill, Experience, ProjectComment
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; falls back to the stdlib encoder
+    orjson = None
+
+# Hand date/datetime/time to Flask's default() instead of orjson's ISO format
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def dumps_bytes(data):
+    """Encode ``data`` as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                      default=DefaultJSONProvider.default).encode('utf-8')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, installed when it is available"""
+
+    def dumps(self, obj, **kwargs):
+        option = _ORJSON_OPTIONS | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class ProjectDTO:
+    __slots__ = ('id', 'title', 'description', 'short_description', 'technologies',
+                 'github_url', 'live_url', 'image_url', 'category')
+    columns = (Project.id, Project.title, Project.description, Project.short_description,
+               Project.technologies, Project.github_url, Project.live_url,
+               Project.image_url, Project.category)
+
+    def __init__(self, row):
+        (self.id, self.title, self.description, self.short_description, technologies,
+         self.github_url, self.live_url, self.image_url, self.category) = row
+        self.technologies = technologies.split(',') if technologies else []
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'short_description': self.short_description,
+            'technologies': self.technologies,
+            'github_url': self.github_url,
+            'live_url': self.live_url,
+            'image_url': self.image_url,
+            'category': self.category,
+        }
+
+
+class SkillDTO:
+    __slots__ = ('id', 'name', 'category', 'proficiency', 'icon_class', 'order_priority')
+    columns = (Skill.id, Skill.name, Skill.category, Skill.proficiency,
+               Skill.icon_class, Skill.order_priority)
+
+    def __init__(self, row):
+        (self.id, self.name, self.category, self.proficiency,
+         self.icon_class, self.order_priority) = row
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'proficiency': self.proficiency,
+            'icon_class': self.icon_class,
+            'order_priority': self.order_priority,
+        }
+
+
+class ExperienceDTO:
+    __slots__ = ('id', 'company', 'position', 'description', 'start_date', 'end_date',
+                 'location', 'company_url', 'order_priority')
+    columns = (Experience.id, Experience.company, Experience.position, Experience.description,
+               Experience.start_date, Experience.end_date, Experience.location,
+               Experience.company_url, Experience.order_priority)
+
+    def __init__(self, row):
+        (self.id, self.company, self.position, self.description, self.start_date,
+         self.end_date, self.location, self.company_url, self.order_priority) = row
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'company': self.company,
+            'position': self.position,
+            'description': self.description,
+            'start_date': _iso(self.start_date),
+            'end_date': _iso(self.end_date),
+            'location': self.location,
+            'company_url': self.company_url,
+            'order_priority': self.order_priority,
+        }
+
+
+class CommentDTO:
+    __slots__ = ('id', 'project_id', 'user_id', 'content', 'created_at')
+    columns = (ProjectComment.id, ProjectComment.project_id, ProjectComment.user_id,
+               ProjectComment.content, ProjectComment.created_at)
+
+    def __init__(self, row):
+        self.id, self.project_id, self.user_id, self.content, self.created_at = row
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'user_id': self.user_id,
+            'content': self.content,
+            'created_at': _iso(self.created_at),
+        }
+
+
+class RowCache:
+    """Encoded bytes per row, keyed by (id, hash of the values); cleared when full"""
+
+    def __init__(self, max_entries=10000):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, dto_class, row):
+        row = tuple(row)
+        key = (dto_class, row[0], hash(row))
+        encoded = self._entries.get(key)
+        if encoded is not None:
+            self.hits += 1
+            return encoded
+        self.misses += 1
+        encoded = dumps_bytes(dto_class(row).to_dict())
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            self._entries[key] = encoded
+        return encoded
+
+
+row_cache = RowCache()
+
+
+def encode_rows(dto_class, rows, cache=row_cache):
+    """Encode column tuples as a JSON array, reusing cached per-row bytes"""
+    return b'[' + b','.join(cache.encode(dto_class, row) for row in rows) + b']'
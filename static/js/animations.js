@@ -6,6 +6,94 @@
 (function() {
     'use strict';
 
+    // ======================================
+    // PERFORMANCE MODE
+    // ======================================
+
+    /**
+     * Low-cost mode: on when the visitor prefers reduced motion or the device
+     * looks constrained (Save-Data, <= 2 cores or <= 2 GB). ?lowpower=1 / ?lowpower=0
+     * forces it on or off and is remembered in localStorage.
+     */
+    function detectLowPower() {
+        const forced = new URLSearchParams(window.location.search).get('lowpower');
+        try {
+            if (forced !== null) {
+                localStorage.setItem('lowPower', forced === '0' ? '0' : '1');
+            }
+            const saved = localStorage.getItem('lowPower');
+            if (saved !== null) return saved === '1';
+        } catch (e) {
+            // Storage disabled: fall back to the device hints
+        }
+
+        const connection = navigator.connection;
+        return Boolean(
+            (connection && connection.saveData) ||
+            (navigator.hardwareConcurrency && navigator.hardwareConcurrency <= 2) ||
+            (navigator.deviceMemory && navigator.deviceMemory <= 2)
+        );
+    }
+
+    const reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)').matches;
+    const lowPower = detectLowPower();
+
+    document.documentElement.classList.toggle('reduce-motion', reducedMotion || lowPower);
+    document.documentElement.classList.toggle('low-power', lowPower);
+
+    /**
+     * One passive scroll listener and one requestAnimationFrame per frame for
+     * every scroll-driven effect. Measure callbacks (layout reads) run first and
+     * only after a resize or a change in page height; scroll callbacks receive
+     * scrollY and should only write.
+     */
+    const measureCallbacks = [];
+    const scrollCallbacks = [];
+    let frameRequested = false;
+    let needsMeasure = true;
+
+    function runFrame() {
+        frameRequested = false;
+        if (needsMeasure) {
+            needsMeasure = false;
+            measureCallbacks.forEach(callback => callback());
+        }
+        const scrollY = window.scrollY;
+        scrollCallbacks.forEach(callback => callback(scrollY));
+    }
+
+    function requestFrame() {
+        if (!frameRequested) {
+            frameRequested = true;
+            requestAnimationFrame(runFrame);
+        }
+    }
+
+    function invalidateLayout() {
+        needsMeasure = true;
+        requestFrame();
+    }
+
+    window.addEventListener('scroll', requestFrame, { passive: true });
+    window.addEventListener('resize', invalidateLayout);
+    if ('ResizeObserver' in window) {
+        // Lazy images and filtering change the page height without a resize
+        new ResizeObserver(invalidateLayout).observe(document.body);
+    }
+
+    const runtime = window.PortfolioRuntime = {
+        reducedMotion: reducedMotion || lowPower,
+        lowPower: lowPower,
+        onMeasure: function(callback) {
+            measureCallbacks.push(callback);
+            invalidateLayout();
+        },
+        onScroll: function(callback) {
+            scrollCallbacks.push(callback);
+            requestFrame();
+        }
+    };
+
     // ======================================
     // INITIALIZATION
     // ======================================
@@ -30,16 +118,15 @@
                 once: true,
                 offset: 50,
                 disable: function() {
-                    return window.innerWidth < 768; // Disable on mobile for performance
+                    // Disable on mobile and in low-cost mode for performance
+                    return runtime.reducedMotion || window.innerWidth < 768;
                 }
             });
 
             // Refresh AOS on dynamic content changes
-            window.addEventListener('resize', function() {
-                setTimeout(() => {
-                    AOS.refresh();
-                }, 500);
-            });
+            window.addEventListener('resize', debounce(function() {
+                AOS.refresh();
+            }, 500));
         }
     }
 
@@ -48,7 +135,9 @@
     // ======================================
 
     function initializeParticleEffects() {
-        createFloatingParticles();
+        if (!runtime.reducedMotion) {
+            createFloatingParticles();
+        }
     }
 
     /**
@@ -107,78 +196,102 @@
     function initializeHoverAnimations() {
         initializeCardHoverEffects();
         initializeButtonHoverEffects();
-        initializeImageHoverEffects();
     }
 
     /**
-     * Card hover effects with 3D transform
+     * Card tilt on hover, delegated from the document so the number of
+     * listeners doesn't grow with the number of cards. Pointer moves are
+     * coalesced into one transform write per frame.
      */
     function initializeCardHoverEffects() {
-        const cards = document.querySelectorAll('.portfolio-card, .skills-category');
+        if (runtime.reducedMotion || !window.matchMedia('(hover: hover)').matches) return;
 
-        cards.forEach(card => {
-            card.addEventListener('mouseenter', function() {
-                this.style.transition = 'transform 0.3s ease';
-                this.style.transform = 'translateY(-10px) rotateX(5deg) rotateY(5deg)';
-                this.style.boxShadow = '0 20px 40px rgba(0, 0, 0, 0.2)';
-            });
+        const selector = '.portfolio-card, .skills-category';
+        let activeCard = null;
+        let pointerX = 0;
+        let pointerY = 0;
+        let tiltRequested = false;
 
-            card.addEventListener('mouseleave', function() {
-                this.style.transform = 'translateY(0) rotateX(0) rotateY(0)';
-                this.style.boxShadow = '';
-            });
+        function resetCard(card) {
+            card.style.transform = '';
+            card.style.boxShadow = '';
+        }
 
-            // Mousemove for subtle tilt effect
-            card.addEventListener('mousemove', function(e) {
-                const rect = this.getBoundingClientRect();
-                const x = e.clientX - rect.left;
-                const y = e.clientY - rect.top;
-                const centerX = rect.width / 2;
-                const centerY = rect.height / 2;
-                
-                const rotateX = (y - centerY) / 10;
-                const rotateY = (centerX - x) / 10;
-                
-                this.style.transform = `translateY(-10px) rotateX(${rotateX}deg) rotateY(${rotateY}deg)`;
-            });
+        function applyTilt() {
+            tiltRequested = false;
+            if (!activeCard) return;
+
+            const rect = activeCard.getBoundingClientRect();
+            const rotateX = (pointerY - rect.top - rect.height / 2) / 10;
+            const rotateY = (rect.width / 2 - (pointerX - rect.left)) / 10;
+
+            activeCard.style.transform = `translateY(-10px) rotateX(${rotateX}deg) rotateY(${rotateY}deg)`;
+        }
+
+        document.addEventListener('pointermove', function(e) {
+            if (e.pointerType !== 'mouse') return;
+
+            const card = e.target.closest ? e.target.closest(selector) : null;
+            if (card !== activeCard) {
+                if (activeCard) resetCard(activeCard);
+                activeCard = card;
+                if (card) {
+                    card.style.transition = 'transform 0.3s ease';
+                    card.style.boxShadow = '0 20px 40px rgba(0, 0, 0, 0.2)';
+                }
+            }
+            if (!card) return;
+
+            pointerX = e.clientX;
+            pointerY = e.clientY;
+            if (!tiltRequested) {
+                tiltRequested = true;
+                requestAnimationFrame(applyTilt);
+            }
+        }, { passive: true });
+
+        document.documentElement.addEventListener('pointerleave', function() {
+            if (activeCard) resetCard(activeCard);
+            activeCard = null;
         });
     }
 
     /**
-     * Button hover effects with ripple animation
+     * Button ripple on click, delegated from the document
      */
     function initializeButtonHoverEffects() {
-        const buttons = document.querySelectorAll('.btn');
-
-        buttons.forEach(button => {
-            button.addEventListener('click', function(e) {
-                const ripple = document.createElement('span');
-                const rect = this.getBoundingClientRect();
-                const size = Math.max(rect.width, rect.height);
-                const x = e.clientX - rect.left - size / 2;
-                const y = e.clientY - rect.top - size / 2;
-
-                ripple.style.cssText = `
-                    position: absolute;
-                    width: ${size}px;
-                    height: ${size}px;
-                    left: ${x}px;
-                    top: ${y}px;
-                    background: rgba(255, 255, 255, 0.3);
-                    border-radius: 50%;
-                    transform: scale(0);
-                    animation: ripple 0.6s ease-out;
-                    pointer-events: none;
-                `;
-
-                this.style.position = 'relative';
-                this.style.overflow = 'hidden';
-                this.appendChild(ripple);
-
-                setTimeout(() => {
-                    ripple.remove();
-                }, 600);
-            });
+        if (runtime.reducedMotion) return;
+
+        document.addEventListener('click', function(e) {
+            const button = e.target.closest ? e.target.closest('.btn') : null;
+            if (!button) return;
+
+            const ripple = document.createElement('span');
+            const rect = button.getBoundingClientRect();
+            const size = Math.max(rect.width, rect.height);
+            const x = e.clientX - rect.left - size / 2;
+            const y = e.clientY - rect.top - size / 2;
+
+            ripple.style.cssText = `
+                position: absolute;
+                width: ${size}px;
+                height: ${size}px;
+                left: ${x}px;
+                top: ${y}px;
+                background: rgba(255, 255, 255, 0.3);
+                border-radius: 50%;
+                transform: scale(0);
+                animation: ripple 0.6s ease-out;
+                pointer-events: none;
+            `;
+
+            button.style.position = 'relative';
+            button.style.overflow = 'hidden';
+            button.appendChild(ripple);
+
+            setTimeout(() => {
+                ripple.remove();
+            }, 600);
         });
 
         // Add ripple animation CSS
@@ -194,24 +307,6 @@
         document.head.appendChild(style);
     }
 
-    /**
-     * Image hover effects with zoom and overlay
-     */
-    function initializeImageHoverEffects() {
-        const images = document.querySelectorAll('.portfolio-image img, .about-image img');
-
-        images.forEach(img => {
-            img.addEventListener('mouseenter', function() {
-                this.style.transition = 'transform 0.5s ease';
-                this.style.transform = 'scale(1.1) rotate(2deg)';
-            });
-
-            img.addEventListener('mouseleave', function() {
-                this.style.transform = 'scale(1) rotate(0deg)';
-            });
-        });
-    }
-
     // ======================================
     // SCROLL ANIMATIONS
     // ======================================
@@ -223,7 +318,7 @@
     }
 
     /**
-     * Scroll progress bar
+     * Scroll progress bar, scaled on the compositor instead of resizing
      */
     function createScrollProgressBar() {
         const progressBar = document.createElement('div');
@@ -232,19 +327,21 @@
             position: fixed;
             top: 0;
             left: 0;
-            width: 0%;
+            width: 100%;
             height: 3px;
             background: linear-gradient(90deg, #3b82f6, #60a5fa);
             z-index: 10001;
-            transition: width 0.1s ease;
+            transform: scaleX(0);
+            transform-origin: 0 0;
         `;
         document.body.appendChild(progressBar);
 
-        window.addEventListener('scroll', function() {
-            const scrollTop = window.pageYOffset;
-            const docHeight = document.body.scrollHeight - window.innerHeight;
-            const scrollPercent = (scrollTop / docHeight) * 100;
-            progressBar.style.width = scrollPercent + '%';
+        let scrollableHeight = 1;
+        runtime.onMeasure(function() {
+            scrollableHeight = Math.max(document.body.scrollHeight - window.innerHeight, 1);
+        });
+        runtime.onScroll(function(scrollY) {
+            progressBar.style.transform = `scaleX(${Math.min(scrollY / scrollableHeight, 1)})`;
         });
     }
 
@@ -252,18 +349,30 @@
      * Parallax scrolling effect
      */
     function initializeParallaxEffect() {
+        if (runtime.reducedMotion) return;
+
         const parallaxElements = document.querySelectorAll('.hero-bg-image, .floating-tech');
+        if (!parallaxElements.length) return;
+
+        let enabled = false;
+        let heroLimit = 0;
+        let lastRate = null;
+        runtime.onMeasure(function() {
+            enabled = window.innerWidth > 768; // Only on desktop for performance
+            // Past this the hero is out of view; stop writing transforms
+            heroLimit = window.innerHeight * 1.5;
+        });
 
-        if (window.innerWidth > 768) { // Only on desktop for performance
-            window.addEventListener('scroll', function() {
-                const scrolled = window.pageYOffset;
-                const rate = scrolled * -0.5;
+        runtime.onScroll(function(scrollY) {
+            if (!enabled) return;
+            const rate = Math.min(scrollY, heroLimit) * -0.5;
+            if (rate === lastRate) return;
+            lastRate = rate;
 
-                parallaxElements.forEach(element => {
-                    element.style.transform = `translateY(${rate}px)`;
-                });
+            parallaxElements.forEach(element => {
+                element.style.transform = `translateY(${rate}px)`;
             });
-        }
+        });
     }
 
     /**
@@ -274,9 +383,9 @@
 
         const counterObserver = new IntersectionObserver((entries) => {
             entries.forEach(entry => {
-                if (entry.isIntersecting && !entry.target.hasAnimated) {
+                if (entry.isIntersecting) {
                     animateCounter(entry.target);
-                    entry.target.hasAnimated = true;
+                    counterObserver.unobserve(entry.target);
                 }
             });
         }, { threshold: 0.7 });
@@ -287,22 +396,27 @@
     }
 
     /**
-     * Animate individual counter
+     * Animate individual counter, one write per frame
      */
     function animateCounter(element) {
         const target = parseInt(element.getAttribute('data-count'));
         const duration = 2000;
-        const increment = target / (duration / 16);
-        let current = 0;
-
-        const timer = setInterval(() => {
-            current += increment;
-            if (current >= target) {
-                current = target;
-                clearInterval(timer);
+
+        if (runtime.reducedMotion) {
+            element.textContent = target;
+            return;
+        }
+
+        let start = null;
+        function step(now) {
+            if (start === null) start = now;
+            const progress = Math.min((now - start) / duration, 1);
+            element.textContent = Math.floor(target * progress);
+            if (progress < 1) {
+                requestAnimationFrame(step);
             }
-            element.textContent = Math.floor(current);
-        }, 16);
+        }
+        requestAnimationFrame(step);
     }
 
     // ======================================
@@ -333,7 +447,7 @@
                             
                             // Add pulse effect
                             bar.style.animation = 'skillPulse 0.5s ease-in-out';
-                        }, index * 200);
+                        }, runtime.reducedMotion ? 0 : index * 200);
                     });
                     
                     observer.unobserve(entry.target);
@@ -359,6 +473,8 @@
      * Floating elements animation
      */
     function initializeFloatingElements() {
+        if (runtime.reducedMotion) return;
+
         const floatingElements = document.querySelectorAll('.floating-tech');
 
         floatingElements.forEach((element, index) => {
@@ -391,64 +507,10 @@
         document.head.appendChild(style);
     }
 
-    // ======================================
-    // PERFORMANCE MONITORING
-    // ======================================
-
-    /**
-     * Monitor animation performance
-     */
-    function monitorPerformance() {
-        let lastTime = performance.now();
-        let frameCount = 0;
-
-        function updateFPS() {
-            frameCount++;
-            const currentTime = performance.now();
-            
-            if (currentTime - lastTime >= 1000) {
-                const fps = Math.round((frameCount * 1000) / (currentTime - lastTime));
-                
-                // Reduce animations if FPS is too low
-                if (fps < 30) {
-                    document.body.classList.add('reduce-animations');
-                }
-                
-                frameCount = 0;
-                lastTime = currentTime;
-            }
-            
-            requestAnimationFrame(updateFPS);
-        }
-
-        requestAnimationFrame(updateFPS);
-    }
-
-    // Start performance monitoring
-    if (window.requestAnimationFrame) {
-        monitorPerformance();
-    }
-
     // ======================================
     // UTILITY FUNCTIONS
     // ======================================
 
-    /**
-     * Throttle function for performance
-     */
-    function throttle(func, limit) {
-        let inThrottle;
-        return function() {
-            const args = arguments;
-            const context = this;
-            if (!inThrottle) {
-                func.apply(context, args);
-                inThrottle = true;
-                setTimeout(() => inThrottle = false, limit);
-            }
-        };
-    }
-
     /**
      * Debounce function for performance
      */
@@ -468,9 +530,4 @@
         };
     }
 
-    // Apply throttling to scroll events
-    window.addEventListener('scroll', throttle(function() {
-        // Throttled scroll handlers go here
-    }, 16)); // ~60fps
-
 })();
@@ -6,6 +6,10 @@
 document.addEventListener('DOMContentLoaded', function() {
     'use strict';
 
+    // Shared scroll loop and low-cost flags (animations.js)
+    const runtime = window.PortfolioRuntime;
+    const scrollBehavior = runtime.reducedMotion ? 'auto' : 'smooth';
+
     // ======================================
     // NAVIGATION
     // ======================================
@@ -16,16 +20,11 @@ document.addEventListener('DOMContentLoaded', function() {
     const navbar = document.getElementById('mainNav');
     const navLinks = document.querySelectorAll('.navbar-nav .nav-link');
     
-    function updateNavbar() {
-        if (window.scrollY > 50) {
-            navbar.classList.add('scrolled');
-        } else {
-            navbar.classList.remove('scrolled');
-        }
+    function updateNavbar(scrollY) {
+        navbar.classList.toggle('scrolled', scrollY > 50);
     }
     
-    window.addEventListener('scroll', updateNavbar);
-    updateNavbar(); // Initial call
+    runtime.onScroll(updateNavbar);
 
     /**
      * Smooth scrolling for navigation links
@@ -50,7 +49,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     const offsetTop = target.offsetTop - navbar.offsetHeight;
                     window.scrollTo({
                         top: offsetTop,
-                        behavior: 'smooth'
+                        behavior: scrollBehavior
                     });
                     
                     // Update active navigation
@@ -62,71 +61,39 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     /**
-     * Update active navigation based on scroll position
+     * Update active navigation based on scroll position. Section bounds are
+     * measured only when the layout changes, and links are touched only when
+     * the active section changes.
      */
-    function updateActiveNavigation() {
-        const sections = document.querySelectorAll('section[id]');
-        const scrollPosition = window.pageYOffset + navbar.offsetHeight + 50;
-
-        sections.forEach(section => {
-            const sectionTop = section.offsetTop;
-            const sectionBottom = sectionTop + section.offsetHeight;
-            const sectionId = section.getAttribute('id');
-            const navLink = document.querySelector(`.navbar-nav .nav-link[href="#${sectionId}"]`);
-
-            if (scrollPosition >= sectionTop && scrollPosition < sectionBottom) {
-                navLinks.forEach(link => link.classList.remove('active'));
-                if (navLink) {
-                    navLink.classList.add('active');
-                }
-            }
-        });
-    }
-
-    window.addEventListener('scroll', updateActiveNavigation);
-
-    // ======================================
-    // HERO SECTION EFFECTS
-    // ======================================
-
+    let sectionBounds = [];
+    let navbarHeight = 0;
+    let activeSectionId = null;
+
+    runtime.onMeasure(function() {
+        navbarHeight = navbar.offsetHeight;
+        sectionBounds = Array.from(document.querySelectorAll('section[id]'), section => ({
+            id: section.getAttribute('id'),
+            top: section.offsetTop,
+            bottom: section.offsetTop + section.offsetHeight
+        }));
+    });
 
-    /**
-     * Counter animation for hero stats
-     */
-    const statNumbers = document.querySelectorAll('.stat-number');
-    
-    function animateCounters() {
-        statNumbers.forEach(stat => {
-            const target = parseInt(stat.getAttribute('data-count'));
-            const duration = 2000; // 2 seconds
-            const increment = target / (duration / 16); // 60fps
-            let current = 0;
-            
-            const timer = setInterval(() => {
-                current += increment;
-                if (current >= target) {
-                    current = target;
-                    clearInterval(timer);
-                }
-                stat.textContent = Math.floor(current);
-            }, 16);
-        });
+    function updateActiveNavigation(scrollY) {
+        const scrollPosition = scrollY + navbarHeight + 50;
+        const current = sectionBounds.find(
+            section => scrollPosition >= section.top && scrollPosition < section.bottom
+        );
+        if (!current || current.id === activeSectionId) return;
+
+        activeSectionId = current.id;
+        const navLink = document.querySelector(`.navbar-nav .nav-link[href="#${current.id}"]`);
+        navLinks.forEach(link => link.classList.remove('active'));
+        if (navLink) {
+            navLink.classList.add('active');
+        }
     }
 
-    // Animate counters when hero section is in view
-    const heroSection = document.getElementById('home');
-    if (heroSection) {
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    animateCounters();
-                    observer.unobserve(entry.target);
-                }
-            });
-        }, { threshold: 0.5 });
-        
-        observer.observe(heroSection);
-    }
+    runtime.onScroll(updateActiveNavigation);
 
     // ======================================
     // SKILLS SECTION
@@ -192,21 +159,6 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
-    /**
-     * Portfolio hover effects
-     */
-    const portfolioCards = document.querySelectorAll('.portfolio-card');
-    
-    portfolioCards.forEach(card => {
-        card.addEventListener('mouseenter', function() {
-            this.style.transform = 'translateY(-10px) scale(1.02)';
-        });
-        
-        card.addEventListener('mouseleave', function() {
-            this.style.transform = 'translateY(0) scale(1)';
-        });
-    });
-
     // ======================================
     // CONTACT FORM
     // ======================================
@@ -286,19 +238,15 @@ document.addEventListener('DOMContentLoaded', function() {
     
     if (scrollToTopBtn) {
         // Show/hide button based on scroll position
-        window.addEventListener('scroll', function() {
-            if (window.pageYOffset > 300) {
-                scrollToTopBtn.classList.add('visible');
-            } else {
-                scrollToTopBtn.classList.remove('visible');
-            }
+        runtime.onScroll(function(scrollY) {
+            scrollToTopBtn.classList.toggle('visible', scrollY > 300);
         });
         
         // Scroll to top on click
         scrollToTopBtn.addEventListener('click', function() {
             window.scrollTo({
                 top: 0,
-                behavior: 'smooth'
+                behavior: scrollBehavior
             });
         });
     }
@@ -335,18 +283,6 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    /**
-     * Debounced resize handler
-     */
-    let resizeTimeout;
-    window.addEventListener('resize', function() {
-        clearTimeout(resizeTimeout);
-        resizeTimeout = setTimeout(function() {
-            // Handle resize-specific logic here
-            updateActiveNavigation();
-        }, 250);
-    });
-
     // ======================================
     // ACCESSIBILITY ENHANCEMENTS
     // ======================================
@@ -429,54 +365,6 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('💡 Dica: Use Ctrl+Shift+I para explorar o código!');
 });
 
-// ======================================
-// PROJECT INTERACTION FUNCTIONS
-// ======================================
-
-/**
- * Toggle project like
- */
-function toggleLike(projectId) {
-    fetch(`/project/${projectId}/like`, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
-            'X-CSRFToken': document.querySelector('meta[name="csrf-token"]')?.getAttribute('content')
-        },
-        credentials: 'same-origin'
-    })
-    .then(response => response.json())
-    .then(data => {
-        if (data.liked !== undefined) {
-            const likeBtn = document.querySelector(`[data-project-id="${projectId}"]`);
-            const likeCount = likeBtn.closest('.portfolio-interactions').querySelector('.like-count');
-            const likeText = likeBtn.querySelector('.like-text');
-            
-            // Update button state
-            if (data.liked) {
-                likeBtn.classList.add('liked');
-                likeText.textContent = 'Descurtir';
-            } else {
-                likeBtn.classList.remove('liked');
-                likeText.textContent = 'Curtir';
-            }
-            
-            // Update like count
-            likeCount.textContent = `${data.likes_count} curtida${data.likes_count !== 1 ? 's' : ''}`;
-            
-            // Add animation effect
-            likeBtn.style.transform = 'scale(1.2)';
-            setTimeout(() => {
-                likeBtn.style.transform = 'scale(1)';
-            }, 150);
-        }
-    })
-    .catch(error => {
-        console.error('Erro ao curtir projeto:', error);
-        alert('Erro ao curtir projeto. Tente novamente.');
-    });
-}
-
 // ======================================
 // LOADING ANIMATIONS
 // ======================================
@@ -527,6 +415,7 @@ const animationObserver = new IntersectionObserver((entries) => {
     entries.forEach(entry => {
         if (entry.isIntersecting) {
             entry.target.classList.add('animate-in');
+            animationObserver.unobserve(entry.target);
             
             // Special animations for different elements
             if (entry.target.classList.contains('portfolio-card')) {
@@ -540,10 +429,12 @@ const animationObserver = new IntersectionObserver((entries) => {
     });
 }, observerOptions);
 
-// Observe elements for animation
-document.querySelectorAll('.portfolio-card, .skill-card, .timeline-item, .stat-card').forEach(el => {
-    animationObserver.observe(el);
-});
+// Observe elements for animation; each is animated once, and not at all in low-cost mode
+if (!window.PortfolioRuntime.reducedMotion) {
+    document.querySelectorAll('.portfolio-card, .skill-card, .timeline-item, .stat-card').forEach(el => {
+        animationObserver.observe(el);
+    });
+}
 
 // ======================================
 // ADMIN FUNCTIONS
@@ -0,0 +1,134 @@
+"""Static export of the public portfolio.
+
+Renders the anonymous view of ``/``, ``/api/projects`` (all categories and
+each category) and every project detail page into a directory that nginx or
+any file server can serve directly:
+
+    index.html
+    project/<id>/index.html
+    api/projects/all.json, api/projects/<category>.json
+    static/...
+
+Pages are rendered with ``static_export`` set in the template context so
+they hydrate like counters from the live SSE endpoint and, via ``/api/me``,
+the CSRF token plus the like buttons and comment forms of logged-in visitors.
+Comments are baked in, and the pages that show them are
+re-exported when a comment is added or approved.
+"""
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+from flask import request, url_for
+
+from app import app, db
+from models import Project
+
+logger = logging.getLogger(__name__)
+
+EXPORT_HEADER = 'X-Static-Export'
+
+# Categories become file names; NDJSON imports can set any string
+CATEGORY_SLUG = re.compile(r'[a-z0-9][a-z0-9_-]{0,63}')
+
+
+@app.context_processor
+def static_export_context():
+    return {'static_export': request.headers.get(EXPORT_HEADER) == '1'}
+
+
+class StaticExporter:
+    """Render public routes through the app and write them atomically"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def _render(self, url):
+        # A fresh app context keeps the caller's g (logged-in user, DB session) out of the page
+        with app.app_context():
+            response = app.test_client().get(
+                url, headers={EXPORT_HEADER: '1'},
+                base_url=app.config.get('STATIC_EXPORT_BASE_URL', 'http://localhost/'))
+            if response.status_code != 200:
+                raise RuntimeError(f'{url} returned {response.status_code}')
+            return response.get_data()
+
+    def _write(self, relative_path, data):
+        path = os.path.join(self.output_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.export-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+
+    def export_index(self):
+        self._write('index.html', self._render('/'))
+
+    def export_api(self):
+        categories = set()
+        for (category,) in db.session.query(Project.category).distinct():
+            if category and category != 'all' and CATEGORY_SLUG.fullmatch(category):
+                categories.add(category)
+            else:
+                logger.warning("Not exporting API file for unsafe category %r", category)
+        api_dir = os.path.join('api', 'projects')
+        with app.test_request_context():
+            urls = {category: url_for('api_projects', category=category) for category in categories}
+        self._write(os.path.join(api_dir, 'all.json'), self._render('/api/projects'))
+        for category in categories:
+            self._write(os.path.join(api_dir, f'{category}.json'), self._render(urls[category]))
+
+        # Drop files of categories that no longer have projects
+        for name in os.listdir(os.path.join(self.output_dir, api_dir)):
+            if name.endswith('.json') and name[:-5] not in categories | {'all'}:
+                os.remove(os.path.join(self.output_dir, api_dir, name))
+        return len(categories) + 1
+
+    def export_project(self, project_id):
+        self._write(os.path.join('project', str(project_id), 'index.html'),
+                    self._render(f'/project/{project_id}'))
+
+    def remove_project(self, project_id):
+        shutil.rmtree(os.path.join(self.output_dir, 'project', str(project_id)), ignore_errors=True)
+
+    def copy_assets(self):
+        shutil.copytree(app.static_folder, os.path.join(self.output_dir, 'static'), dirs_exist_ok=True)
+
+    def export_all(self):
+        """Full export; returns the number of files written"""
+        self.copy_assets()
+        self.export_index()
+        written = 1 + self.export_api()
+
+        project_ids = {project_id for (project_id,) in db.session.query(Project.id)}
+        project_root = os.path.join(self.output_dir, 'project')
+        if os.path.isdir(project_root):
+            for name in os.listdir(project_root):
+                if name.isdigit() and int(name) not in project_ids:
+                    self.remove_project(int(name))
+        for project_id in project_ids:
+            self.export_project(project_id)
+        return written + len(project_ids)
+
+
+def refresh_static_export(project_ids=(), removed_project_ids=(), index=True, api=False):
+    """Incrementally re-export pages affected by a commit, when exporting is enabled"""
+    output_dir = app.config.get('STATIC_EXPORT_DIR')
+    if not output_dir:
+        return
+    exporter = StaticExporter(output_dir)
+    try:
+        for project_id in removed_project_ids:
+            exporter.remove_project(project_id)
+        for project_id in project_ids:
+            exporter.export_project(project_id)
+        if api:
+            exporter.export_api()
+        if index:
+            exporter.export_index()
+    except Exception as e:
+        # The dynamic site is still correct; the next full export will catch up
+        logger.error("Error refreshing static export: %s", e)
@@ -0,0 +1,88 @@
+"""Bounded image upload processing.
+
+Uploads arrive already spooled: Werkzeug streams multipart file parts into a
+``SpooledTemporaryFile`` and stops at ``MAX_CONTENT_LENGTH``; remote images
+are spooled the same way by ``spool()``. Before anything is decoded, the
+file size is checked and ``Image.open`` (which only parses the header, and
+only with the allowed format plugins) reports format and pixel dimensions,
+so oversized files and decompression bombs are rejected without allocating
+their bitmaps. JPEGs are then decoded at a reduced DCT scale close to the
+target thumbnail via ``Image.draft``.
+"""
+import os
+import tempfile
+
+from PIL import Image, UnidentifiedImageError
+
+FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+SPOOL_MEMORY_BYTES = 512 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """Rejected upload; the message is shown to the user"""
+
+
+def _size_of(fileobj):
+    position = fileobj.tell()
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(position)
+    return size
+
+
+def _too_large(max_bytes):
+    return UploadError(f'Imagem muito grande (máximo {max_bytes // (1024 * 1024)} MB).')
+
+
+def spool(stream, max_bytes):
+    """Copy a stream into a spooled temp file, giving up as soon as it passes ``max_bytes``"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    total = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            spooled.close()
+            raise _too_large(max_bytes)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def save_image(fileobj, path, output_size, max_bytes, max_pixels):
+    """Validate an image from its header, then write a JPEG thumbnail to ``path``.
+
+    Limits are passed in rather than read from the app config, so image
+    downloads can run on threads without an app context.
+    """
+    if _size_of(fileobj) > max_bytes:
+        raise _too_large(max_bytes)
+
+    try:
+        # Not a context manager: the caller owns fileobj, and rebinding img
+        # below must free the full-size bitmap before the resize
+        img = Image.open(fileobj, formats=FORMATS)
+        width, height = img.size
+        # Also covers Pillow's DecompressionBombWarning range as long as
+        # max_pixels stays below Image.MAX_IMAGE_PIXELS
+        if width * height > max_pixels:
+            raise UploadError(f'Imagem com dimensões muito grandes ({width}x{height}).')
+
+        # No-op except for JPEG, which libjpeg then decodes at the smallest
+        # 1/2..1/8 scale that still covers the thumbnail
+        img.draft('RGB', output_size)
+        if img.mode != 'RGB':
+            # Before resizing: palette images would resize with NEAREST and
+            # RGBA with an extra premultiplied copy
+            img = img.convert('RGB')
+        img.thumbnail(output_size, Image.Resampling.LANCZOS)
+        img.save(path, 'JPEG', quality=90, optimize=True)
+    except UnidentifiedImageError:
+        raise UploadError('Formato de imagem não suportado. Use JPG, PNG, GIF ou WEBP.')
+    except Image.DecompressionBombError:
+        raise UploadError('Imagem com dimensões muito grandes.')
+    except (OSError, SyntaxError) as e:
+        raise UploadError('Imagem corrompida ou incompleta.') from e
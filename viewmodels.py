@@ -0,0 +1,50 @@
+"""Template-ready views of models for the public pages.
+
+Everything a template would otherwise compute per row (splitting technologies,
+counting likes, checking whether the visitor liked a project) is resolved here
+with a fixed number of queries, so rendering only reads plain attributes.
+"""
+from app import db
+from models import ProjectLike, ProjectRanking
+
+
+class ProjectCard:
+    """Portfolio grid entry for one project"""
+    __slots__ = ('id', 'title', 'short_description', 'category', 'image_url',
+                 'live_url', 'github_url', 'technologies', 'likes_count', 'liked')
+
+    def __init__(self, project, likes_count=0, liked=False):
+        self.id = project.id
+        self.title = project.title
+        self.short_description = project.short_description
+        self.category = project.category
+        self.image_url = project.image_url
+        self.live_url = project.live_url
+        self.github_url = project.github_url
+        self.technologies = split_technologies(project.technologies)
+        self.likes_count = likes_count
+        self.liked = liked
+
+
+def split_technologies(technologies):
+    """Turn the comma-separated technologies column into a clean list"""
+    if not technologies:
+        return []
+    return [tech.strip() for tech in technologies.split(',') if tech.strip()]
+
+
+def build_project_cards(projects, user=None):
+    """Build cards for ``projects`` with two queries regardless of their number"""
+    project_ids = [project.id for project in projects]
+    if not project_ids:
+        return []
+
+    likes = dict(db.session.query(ProjectRanking.project_id, ProjectRanking.likes_count)
+                 .filter(ProjectRanking.project_id.in_(project_ids)))
+
+    liked = set()
+    if user is not None and user.is_authenticated:
+        liked = {project_id for (project_id,) in db.session.query(ProjectLike.project_id)
+                 .filter(ProjectLike.user_id == user.id, ProjectLike.project_id.in_(project_ids))}
+
+    return [ProjectCard(project, likes.get(project.id, 0), project.id in liked) for project in projects]